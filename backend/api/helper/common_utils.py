@@ -3,6 +3,7 @@ Common utilities shared across all backend services
 """
 import hashlib
 import threading
+from functools import lru_cache
 import pika
 import os
 from dotenv import load_dotenv
@@ -10,9 +11,10 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@lru_cache(maxsize=10000)
 def get_profile_hash(profile_url):
-    """Generate unique hash from profile URL"""
-    return hashlib.md5(profile_url.encode()).hexdigest()[:8]
+    """Generate unique hash from profile URL (4-byte BLAKE2b, 8 hex chars)"""
+    return hashlib.blake2b(profile_url.encode(), digest_size=4).hexdigest()
 
 
 class StatsManager:
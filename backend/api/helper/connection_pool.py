@@ -5,6 +5,7 @@ import threading
 import time
 import queue
 import os
+from datetime import datetime, timezone
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -202,14 +203,16 @@ class PooledSupabaseManager:
             self.pool.return_connection(client)
     
     def update_lead_after_scrape(self, profile_url, profile_data):
-        """Update lead after scraping using pooled connection"""
+        """Upsert lead after scraping using pooled connection (inserts if the URL is new)"""
         def operation(client):
-            result = client.table('leads_list').update({
+            result = client.table('leads_list').upsert({
+                'profile_url': profile_url,
+                'name': profile_data.get('name', 'Unknown'),
                 'profile_data': profile_data,
                 'connection_status': 'scraped',
-                'processed_at': time.time()
-            }).eq('profile_url', profile_url).execute()
-            return result.data is not None
+                'processed_at': datetime.now(timezone.utc).isoformat()
+            }, on_conflict='profile_url').execute()
+            return bool(result.data)
         
         return self.execute_with_pool(operation)
     
@@ -221,6 +224,40 @@ class PooledSupabaseManager:
         
         return self.execute_with_pool(operation)
     
+    def get_existing_leads_map(self, template_id, page_size=1000):
+        """Get {profile_url: lead} for a template's already-complete leads
+        
+        Only leads the crawler would skip are returned (scraped, with profile and
+        scoring data, score >= 0); the JSON columns are filtered server-side rather
+        than downloaded, so they are marked present on each lead. Pages through
+        the results so PostgREST's max-rows limit can't truncate the map.
+        """
+        def operation(client):
+            leads_map = {}
+            start = 0
+            while True:
+                result = client.table('leads_list')\
+                    .select('profile_url, score')\
+                    .eq('template_id', template_id)\
+                    .eq('connection_status', 'scraped')\
+                    .gte('score', 0)\
+                    .not_.is_('profile_data', 'null')\
+                    .not_.is_('scoring_data', 'null')\
+                    .neq('profile_data', '{}')\
+                    .neq('scoring_data', '{}')\
+                    .order('profile_url')\
+                    .range(start, start + page_size - 1)\
+                    .execute()
+                rows = result.data or []
+                for lead in rows:
+                    lead.update(connection_status='scraped', profile_data=True, scoring_data=True)
+                    leads_map[lead['profile_url']] = lead
+                if len(rows) < page_size:
+                    return leads_map
+                start += page_size
+
+        return self.execute_with_pool(operation)
+
     def get_leads_by_template_id(self, template_id):
         """Get leads by template ID using pooled connection"""
         def operation(client):
@@ -340,14 +340,23 @@ class QueryOptimizer:
     # BATCH OPERATIONS
     # ========================================================================
     
-    def batch_update_leads(self, updates: List[Dict]) -> bool:
+    def batch_update_leads(self, updates: List[Dict], batch_size: int = 25) -> bool:
         """
         Batch update leads for better performance
+        Upserts on profile_url (unique index) - one request per batch_size rows
         """
         try:
+            # PostgREST bulk upsert needs identical keys in every row, so group
+            # updates by their column set before chunking
+            groups: Dict[tuple, List[Dict]] = {}
             for update in updates:
-                profile_url = update.pop('profile_url')
-                self.client.table('leads_list').update(update).eq('profile_url', profile_url).execute()
+                groups.setdefault(tuple(sorted(update)), []).append(update)
+            
+            for rows in groups.values():
+                for i in range(0, len(rows), batch_size):
+                    self.client.table('leads_list').upsert(
+                        rows[i:i + batch_size], on_conflict='profile_url'
+                    ).execute()
             
             # Clear leads cache after batch update
             self.clear_cache('leads')
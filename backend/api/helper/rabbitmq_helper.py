@@ -5,7 +5,7 @@ Centralized queue management
 import os
 import json
 import pika
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Optional
 
 # LavinMQ Configuration
@@ -91,19 +91,19 @@ class QueuePublisher:
             return True
             
         except Exception as e:
-            print(f"❌ Queue publish failed: {e}")
-            print(f"   Queue: {queue_name}")
-            print(f"   Error type: {type(e).__name__}")
-            import traceback
-            traceback.print_exc()
+            print(f"❌ Queue publish failed ({type(e).__name__}) on {queue_name}: {e}")
             return False
     
-    def publish_crawler_job(self, profile_url: str, template_id: Optional[str] = None) -> bool:
-        """Publish crawler job to queue"""
+    def publish_crawler_job(self, profile_url: str, template_id: Optional[str] = None, timestamp: Optional[str] = None) -> bool:
+        """Publish crawler job to queue
+        
+        Args:
+            timestamp: ISO timestamp shared by a batch (computed here if not given)
+        """
         message = {
             'url': profile_url,
             'template_id': template_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp or datetime.now(timezone.utc).isoformat(),
             'trigger': 'api'
         }
         return self.publish(RABBITMQ_QUEUE, message)
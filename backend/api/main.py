@@ -5,13 +5,12 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict
-from datetime import datetime
+from datetime import datetime, timezone
 import asyncio
 import pytz
 import os
 import sys
 import json
-import re
 import time
 import uuid
 import logging
@@ -885,10 +884,14 @@ async def execute_schedule_manually(schedule_id: str):
         
         print(f"📤 Manual execution: Queueing {len(needs_processing)} leads...")
         
+        # One timestamp for the whole run instead of one per lead
+        queued_at = datetime.now(timezone.utc).isoformat()
+        
         for lead in needs_processing:
             success = queue_publisher.publish_crawler_job(
                 profile_url=lead['profile_url'],
-                template_id=template_id
+                template_id=template_id,
+                timestamp=queued_at
             )
             if success:
                 queued_count += 1
@@ -1238,195 +1241,6 @@ async def generate_and_save_requirements(request: RequirementsGenerateRequest):
     except Exception as e:
         print(f"❌ Error generating and saving requirements: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-def generate_requirements_simple(job_description, position_title):
-    """Simple requirements generation fallback - same logic as requirements_generator.py"""
-
-    def extract_bullet_points(text):
-        """Extract bullet points from text"""
-        if not text:
-            return []
-
-        bullets = []
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-
-        # Remove heading line if present
-        if lines and any(keyword in lines[0].lower() for keyword in ['kualifikasi', 'persyaratan', 'requirements', 'syarat']):
-            lines = lines[1:]
-
-        for line in lines:
-            # Skip if too short
-            if len(line) < 5:
-                continue
-
-            # Clean bullet markers
-            line_clean = re.sub(r'^[•\-\*○\d+\.\)]\s*', '', line).strip()
-
-            if line_clean and len(line_clean) >= 5:
-                bullets.append(line_clean)
-
-        return bullets
-
-    def classify_requirement(text, req_id):
-        """Classify a single requirement and extract structured value"""
-        text_lower = text.lower()
-
-        # Priority 1: Gender
-        if any(word in text_lower for word in ['pria', 'wanita', 'laki-laki', 'perempuan', 'male', 'female']):
-            # Determine gender value
-            if 'pria / wanita' in text_lower or 'pria/wanita' in text_lower or ('pria' in text_lower and 'wanita' in text_lower):
-                gender_value = 'any'
-            elif any(word in text_lower for word in ['wanita', 'perempuan', 'female']):
-                gender_value = 'female'
-            elif any(word in text_lower for word in ['pria', 'laki-laki', 'male']):
-                gender_value = 'male'
-            else:
-                gender_value = 'any'
-
-            return {
-                'id': f'req_{req_id}',
-                'label': text,
-                'type': 'gender',
-                'value': gender_value
-            }
-
-        # Priority 2: Age
-        if any(word in text_lower for word in ['usia', 'umur', 'age']):
-            # Extract age range
-            age_patterns = [
-                r'(\d+)\s*-\s*(\d+)\s*tahun',
-                r'(\d+)\s*sampai\s*(\d+)\s*tahun',
-                r'maksimal\s*(\d+)\s*tahun',
-                r'max\s*(\d+)\s*tahun'
-            ]
-
-            age_value = {'min': 18, 'max': 35}  # default
-
-            for pattern in age_patterns:
-                match = re.search(pattern, text_lower)
-                if match:
-                    if match.lastindex >= 2:
-                        age_value = {
-                            'min': int(match.group(1)),
-                            'max': int(match.group(2))
-                        }
-                    else:
-                        age_value = {
-                            'min': 18,
-                            'max': int(match.group(1))
-                        }
-                    break
-
-            return {
-                'id': f'req_{req_id}',
-                'label': text,
-                'type': 'age',
-                'value': age_value
-            }
-
-        # Priority 3: Education
-        if any(word in text_lower for word in ['pendidikan', 'education', 'lulusan', 'ijazah', 'sma', 'smk', 'diploma', 's1', 'sarjana']):
-            # Determine education level
-            if any(word in text_lower for word in ['sarjana', 's1', 's-1', 'bachelor']):
-                edu_value = 'bachelor'
-            elif any(word in text_lower for word in ['diploma', 'd3', 'd-3']):
-                edu_value = 'diploma'
-            elif any(word in text_lower for word in ['sma', 'smk', 'high school', 'slta']):
-                edu_value = 'high school'
-            else:
-                edu_value = 'high school'  # default
-
-            return {
-                'id': f'req_{req_id}',
-                'label': text,
-                'type': 'education',
-                'value': edu_value
-            }
-
-        # Priority 4: Location
-        if any(word in text_lower for word in ['penempatan', 'lokasi', 'domisili', 'location', 'ditempatkan']):
-            # Extract location name
-            location_match = re.search(r'(?:penempatan|lokasi|domisili|location|ditempatkan)\s*:?\s*([A-Za-z\s]+)', text, re.IGNORECASE)
-            if location_match:
-                location_value = location_match.group(1).strip()
-                # Remove trailing words like "atau", "dan"
-                location_value = re.sub(r'\s+(atau|or|dan|and)\s+.*', '', location_value, flags=re.IGNORECASE).strip()
-            else:
-                location_value = 'any'
-
-            return {
-                'id': f'req_{req_id}',
-                'label': text,
-                'type': 'location',
-                'value': location_value.lower()
-            }
-
-        # Priority 5: Experience (with years)
-        if any(word in text_lower for word in ['pengalaman', 'experience', 'berpengalaman']):
-            # Extract years
-            exp_patterns = [
-                r'(?:minimal|minimum|min\.?)\s*(\d+)\s*(?:tahun|years?)',
-                r'(\d+)\s*(?:tahun|years?)\s*(?:pengalaman|experience)',
-                r'(\d+)\+?\s*(?:tahun|years?)'
-            ]
-
-            exp_value = 1  # default
-
-            for pattern in exp_patterns:
-                match = re.search(pattern, text_lower)
-                if match:
-                    exp_value = int(match.group(1))
-                    break
-
-            return {
-                'id': f'req_{req_id}',
-                'label': text,
-                'type': 'experience',
-                'value': exp_value
-            }
-
-        # Default: Skill
-        return {
-            'id': f'req_{req_id}',
-            'label': text,
-            'type': 'skill',
-            'value': text.lower()
-        }
-
-    # Extract bullet points from job description
-    bullets = extract_bullet_points(job_description)
-
-    # Classify each bullet point
-    requirements_array = []
-    for i, bullet in enumerate(bullets):
-        req = classify_requirement(bullet, i + 1)
-        requirements_array.append(req)
-
-    # Add default requirements if none found
-    if len(requirements_array) == 0:
-        requirements_array = [
-            {
-                'id': 'req_1',
-                'label': 'Minimum 1 year experience',
-                'type': 'experience',
-                'value': 1
-            },
-            {
-                'id': 'req_2',
-                'label': 'Education: High School',
-                'type': 'education',
-                'value': 'high school'
-            }
-        ]
-
-    # Build final output - same format as requirements_generator.py
-    return {
-        'position': position_title,
-        'requirements': requirements_array
-    }
-
-
-
-
 
 
 @app.post("/api/requirements/save", tags=["Requirements"])
@@ -1543,105 +1357,34 @@ async def create_external_schedule(request: ExternalScheduleRequest):
         print(f"📝 Job description length: {len(request.job_description)} characters")
         
         try:
-            # Method 1: Try to use requirements_generator.py
+            # Method 1: Use requirements_generator.py (same module as the requirements endpoints)
             requirements_result = None
             method_used = "unknown"
             
             try:
-                import sys
-                from pathlib import Path
-                
-                # Try to import from shared module first
-                shared_path = Path(__file__).parent.parent / "shared"
-                shared_path_str = str(shared_path.absolute())
-                
-                if shared_path_str not in sys.path:
-                    sys.path.insert(0, shared_path_str)
-                
-                from requirements_utils import generate_requirements_from_text
-                
-                print(f"✅ Using shared requirements_utils module")
+                from requirements_generator import generate_requirements_from_text
                 
                 requirements_result = generate_requirements_from_text(
                     job_description=request.job_description,
                     position_title=request.job_title
                 )
                 
-                method_used = "shared_requirements_utils"
-                print(f"✅ Used shared requirements_utils successfully")
+                method_used = "requirements_generator.py"
+                print(f"✅ Used requirements_generator.py")
                 
             except Exception as import_error:
-                print(f"⚠️ Shared module failed: {import_error}")
+                print(f"⚠️ requirements_generator failed: {import_error}, using default requirements")
                 
-                # Fallback: Try original requirements_generator.py
-                try:
-                    scoring_path = Path(__file__).parent.parent / "scoring"
-                    scoring_path_str = str(scoring_path.absolute())
-                    
-                    if scoring_path_str not in sys.path:
-                        sys.path.insert(0, scoring_path_str)
-                    
-                    from requirements_generator import generate_requirements_from_text
-                    
-                    requirements_result = generate_requirements_from_text(
-                        job_description=request.job_description,
-                        position_title=request.job_title
-                    )
-                    
-                    method_used = "requirements_generator.py"
-                    print(f"✅ Used requirements_generator.py fallback")
-                    
-                except Exception as fallback_error:
-                    print(f"⚠️ All imports failed, using inline logic")
-                    
-                    # Final fallback: inline logic
-                    bullets = []
-                    lines = [line.strip() for line in request.job_description.split('\n') if line.strip()]
-                    
-                    if lines and any(keyword in lines[0].lower() for keyword in ['kualifikasi', 'persyaratan', 'requirements', 'syarat']):
-                        lines = lines[1:]
-                    
-                    for line in lines:
-                        if len(line) >= 5:
-                            line_clean = re.sub(r'^[•\-\*○\d+\.\)]\s*', '', line).strip()
-                            if line_clean and len(line_clean) >= 5:
-                                bullets.append(line_clean)
-                    
-                    requirements_array = []
-                    for i, bullet in enumerate(bullets):
-                        text_lower = bullet.lower()
-                        req_id = i + 1
-                        
-                        if any(word in text_lower for word in ['pengalaman', 'experience']):
-                            exp_patterns = [r'(\d+)\s*(?:tahun|years?)']
-                            exp_value = 1
-                            for pattern in exp_patterns:
-                                match = re.search(pattern, text_lower)
-                                if match:
-                                    exp_value = int(match.group(1))
-                                    break
-                            req = {'id': f'req_{req_id}', 'label': bullet, 'type': 'experience', 'value': exp_value}
-                        elif any(word in text_lower for word in ['pendidikan', 'education', 's1', 'sarjana', 'diploma']):
-                            edu_value = 'bachelor' if any(word in text_lower for word in ['s1', 'sarjana']) else 'high school'
-                            req = {'id': f'req_{req_id}', 'label': bullet, 'type': 'education', 'value': edu_value}
-                        else:
-                            req = {'id': f'req_{req_id}', 'label': bullet, 'type': 'skill', 'value': bullet.lower()}
-                        
-                        requirements_array.append(req)
-                    
-                    if len(requirements_array) == 0:
-                        requirements_array = [
-                            {'id': 'req_1', 'label': f'Experience in {request.job_title}', 'type': 'experience', 'value': 1},
-                            {'id': 'req_2', 'label': 'Good communication skills', 'type': 'skill', 'value': 'communication'}
-                        ]
-                    
-                    requirements_result = {
-                        'position': request.job_title,
-                        'requirements': requirements_array
-                    }
-                    
-                    method_used = "inline_final_fallback"
-                    print(f"✅ Used inline final fallback - generated {len(requirements_array)} requirements")
+                # Final fallback: generic checklist so the template still gets requirements
+                requirements_result = {
+                    'position': request.job_title,
+                    'requirements': [
+                        {'id': 'req_1', 'label': f'Experience in {request.job_title}', 'type': 'experience', 'value': 1},
+                        {'id': 'req_2', 'label': 'Good communication skills', 'type': 'skill', 'value': 'communication'}
+                    ]
+                }
+                
+                method_used = "default_fallback"
             
             if requirements_result and 'requirements' in requirements_result:
                 requirements_array = requirements_result['requirements']
@@ -5,17 +5,79 @@ Usage: python requirements_generator.py
 """
 import json
 import re
+import sys
+from functools import lru_cache
+from html import unescape
 from pathlib import Path
 
 
+# Patterns compiled once at import - classify_requirement runs them per bullet
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_BULLET_RE = re.compile(r'^[•\-\*○\d+\.\)]\s*')
+_HEADING_KEYWORDS = ('kualifikasi', 'persyaratan', 'requirements', 'syarat')
+
+# Tried in order, first match wins (priority order, not leftmost position)
+_AGE_PATTERNS = tuple(re.compile(p) for p in (
+    r'(\d+)\s*-\s*(\d+)\s*tahun',
+    r'(\d+)\s*sampai\s*(\d+)\s*tahun',
+    r'maksimal\s*(\d+)\s*tahun',
+    r'max\s*(\d+)\s*tahun'
+))
+
+# Run on the lowercased bullet; the capture is bounded so long letter runs can't be re-scanned endlessly
+_LOCATION_RE = re.compile(r'\b(?:penempatan|lokasi|domisili|location|ditempatkan)\s*:?\s*([a-z\s]{1,60})')
+_LOCATION_TAIL_RE = re.compile(r'\s+(atau|or|dan|and)\s+.*')
+
+# Most specific first; tried in order, first match wins
+_EXP_PATTERNS = tuple(re.compile(p) for p in (
+    r'(\d+)\+?\s*years?\s+experience',  # "5+ years experience" - most specific first
+    r'(\d+)\+?\s*years?\s+of\s+experience',  # "5+ years of experience"
+    r'experience.*?(\d+)\+?\s*years?',  # "experience with 5+ years"
+    r'(\d+)\+?\s*years?\s+(?:pengalaman|experience)',  # "5+ years pengalaman"
+    r'(?:minimal|minimum|min\.?)\s*(\d+)\s*(?:tahun|years?)',  # "minimum 5 years"
+    r'(\d+)\s*(?:tahun|years?)\s*(?:pengalaman|experience)',  # "5 tahun pengalaman"
+    r'(\d+)\+?\s*(?:tahun|years?)',  # "5+ years" - least specific last
+))
+
+# Keyword stems matched at word boundaries, so inflections still count
+# (aged, educational, experiences, masters) but words that merely contain a
+# keyword don't (manager, agent, language, smart, mastery)
+_GENDER_KEYWORDS_RE = re.compile(r'\b(?:pria|wanita|laki|perempuan|males?|females?)\b')
+_FEMALE_RE = re.compile(r'\b(?:wanita|perempuan|females?)\b')
+_MALE_RE = re.compile(r'\b(?:pria|laki|males?)\b')
+_PRIA_AND_WANITA_RE = re.compile(r'\bpria\b.*\bwanita\b|\bwanita\b.*\bpria\b')
+
+_AGE_KEYWORDS_RE = re.compile(r'\b(?:usia|umur|age[ds]?)\b')
+
+_EDUCATION_KEYWORDS_RE = re.compile(
+    r'\b(?:pendidikan|education\w*|lulusan|ijazah|degrees?|bachelors?|masters?|phd'
+    r'|sarjana|s-?[12]|diplomas?|d-?3|sma|smk|slta)\b'
+)
+_BACHELOR_RE = re.compile(r'\b(?:bachelors?|sarjana|s-?1)\b')
+_MASTER_RE = re.compile(r'\b(?:masters?|s-?2)\b')
+_DIPLOMA_RE = re.compile(r'\b(?:diplomas?|d-?3)\b')
+_HIGH_SCHOOL_RE = re.compile(r'\b(?:sma|smk|slta|high school)\b')
+
+_LOCATION_KEYWORDS_RE = re.compile(r'\b(?:penempatan|lokasi|domisili|locations?|ditempatkan)\b')
+
+_EXPERIENCE_KEYWORDS_RE = re.compile(r'\b(?:(?:ber)?pengalaman\w*|experienc\w*|years|tahun)\b')
+
+_SKILL_PREFIX_RE = re.compile(r'^(must have|nice to have|strong|good|excellent|proficiency in|experience with|knowledge of|familiar with|understanding of)[\s:]+')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_SLUG_RE = re.compile(r'[^a-z0-9_]')
+
+
 def clean_html(text):
     """Remove HTML tags from text"""
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'\s+', ' ', text)
-    text = text.replace('&nbsp;', ' ').replace('&amp;', '&')
-    text = text.replace('&lt;', '<').replace('&gt;', '>')
-    text = text.replace('&quot;', '"')
-    return text.strip()
+    # Plain-text paste: nothing to strip or unescape, only whitespace to collapse
+    if '<' not in text and '&' not in text:
+        return ' '.join(text.split())
+    
+    text = _HTML_TAG_RE.sub('', text)
+    # Unescape before collapsing so &nbsp; (\xa0) folds into the single space
+    text = unescape(text)
+    return ' '.join(text.split())
 
 
 def extract_bullet_points(text):
@@ -24,182 +86,185 @@ def extract_bullet_points(text):
         return []
     
     bullets = []
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    
-    # Remove heading line if present
-    if lines and any(keyword in lines[0].lower() for keyword in ['kualifikasi', 'persyaratan', 'requirements', 'syarat']):
-        lines = lines[1:]
+    is_first_line = True
     
-    for line in lines:
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        
+        # Skip heading line if present
+        if is_first_line:
+            is_first_line = False
+            line_lower = line.lower()
+            if any(keyword in line_lower for keyword in _HEADING_KEYWORDS):
+                continue
+        
         # Skip if too short
         if len(line) < 5:
             continue
         
         # Clean bullet markers
-        line_clean = re.sub(r'^[•\-\*○\d+\.\)]\s*', '', line).strip()
+        line_clean = _BULLET_RE.sub('', line).strip()
         
-        if line_clean and len(line_clean) >= 5:
+        if len(line_clean) >= 5:
             bullets.append(line_clean)
     
     return bullets
 
 
-def classify_requirement(text, req_id):
-    """Classify a single requirement and extract structured value"""
-    text_lower = text.lower()
+def _classify_gender(text, text_lower):
+    if _PRIA_AND_WANITA_RE.search(text_lower):
+        gender_value = 'any'
+    elif _FEMALE_RE.search(text_lower):
+        gender_value = 'female'
+    elif _MALE_RE.search(text_lower):
+        gender_value = 'male'
+    else:
+        gender_value = 'any'
     
-    # Priority 1: Gender
-    if any(word in text_lower for word in ['pria', 'wanita', 'laki-laki', 'perempuan', 'male', 'female']):
-        # Determine gender value
-        if 'pria / wanita' in text_lower or 'pria/wanita' in text_lower or ('pria' in text_lower and 'wanita' in text_lower):
-            gender_value = 'any'
-        elif any(word in text_lower for word in ['wanita', 'perempuan', 'female']):
-            gender_value = 'female'
-        elif any(word in text_lower for word in ['pria', 'laki-laki', 'male']):
-            gender_value = 'male'
-        else:
-            gender_value = 'any'
-        
-        return {
-            'id': 'gender',
-            'type': 'gender',
-            'label': text,
-            'value': gender_value
-        }
-    
-    # Priority 2: Age
-    if any(word in text_lower for word in ['usia', 'umur', 'age']):
-        # Extract age range
-        age_patterns = [
-            r'(\d+)\s*-\s*(\d+)\s*tahun',
-            r'(\d+)\s*sampai\s*(\d+)\s*tahun',
-            r'maksimal\s*(\d+)\s*tahun',
-            r'max\s*(\d+)\s*tahun'
-        ]
-        
-        age_value = {'min': 18, 'max': 35}  # default
-        
-        for pattern in age_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                if match.lastindex >= 2:
-                    age_value = {
-                        'min': int(match.group(1)),
-                        'max': int(match.group(2))
-                    }
-                else:
-                    age_value = {
-                        'min': 18,
-                        'max': int(match.group(1))
-                    }
-                break
-        
-        return {
-            'id': 'age_range',
-            'type': 'age',
-            'label': text,
-            'value': age_value
-        }
-    
-    # Priority 3: Education - FIXED DETECTION (more specific keywords)
-    education_keywords = ['pendidikan', 'education', 'lulusan', 'ijazah', 'degree', 'bachelor', 'master', 'phd', 'sarjana', 's1', 's-1', 's2', 's-2', 'diploma', 'd3', 'd-3', 'sma', 'smk', 'slta']
-    if any(word in text_lower for word in education_keywords):
-        # Determine education level
-        if any(word in text_lower for word in ['bachelor', 'sarjana', 's1', 's-1']) or 'bachelor degree' in text_lower:
-            edu_value = 'bachelor'
-        elif any(word in text_lower for word in ['master', 's2', 's-2']):
-            edu_value = 'master'
-        elif any(word in text_lower for word in ['diploma', 'd3', 'd-3']):
-            edu_value = 'diploma'
-        elif any(word in text_lower for word in ['sma', 'smk', 'high school', 'slta']):
-            edu_value = 'high school'
-        elif 'degree' in text_lower:  # Any degree mention defaults to bachelor
-            edu_value = 'bachelor'
-        else:
-            edu_value = 'bachelor'  # default for education mentions
-        
-        return {
-            'id': 'education',
-            'type': 'education',
-            'label': text,
-            'value': edu_value
-        }
-    
-    # Priority 4: Location
-    if any(word in text_lower for word in ['penempatan', 'lokasi', 'domisili', 'location', 'ditempatkan']):
-        # Extract location name
-        location_match = re.search(r'(?:penempatan|lokasi|domisili|location|ditempatkan)\s*:?\s*([A-Za-z\s]+)', text, re.IGNORECASE)
-        if location_match:
-            location_value = location_match.group(1).strip()
-            # Remove trailing words like "atau", "dan"
-            location_value = re.sub(r'\s+(atau|or|dan|and)\s+.*', '', location_value, flags=re.IGNORECASE).strip()
-        else:
-            location_value = 'any'
-        
-        return {
-            'id': 'location',
-            'type': 'location',
-            'label': text,
-            'value': location_value.lower()
-        }
-    
-    # Priority 5: Experience (with years) - FIXED DETECTION
-    if any(word in text_lower for word in ['pengalaman', 'experience', 'berpengalaman', 'years', 'tahun']):
-        # Extract years - FIXED PATTERNS (more specific order)
-        exp_patterns = [
-            r'(\d+)\+?\s*years?\s+experience',  # "5+ years experience" - most specific first
-            r'(\d+)\+?\s*years?\s+of\s+experience',  # "5+ years of experience"
-            r'experience.*?(\d+)\+?\s*years?',  # "experience with 5+ years"
-            r'(\d+)\+?\s*years?\s+(?:pengalaman|experience)',  # "5+ years pengalaman"
-            r'(?:minimal|minimum|min\.?)\s*(\d+)\s*(?:tahun|years?)',  # "minimum 5 years"
-            r'(\d+)\s*(?:tahun|years?)\s*(?:pengalaman|experience)',  # "5 tahun pengalaman"
-            r'(\d+)\+?\s*(?:tahun|years?)',  # "5+ years" - least specific last
-        ]
-        
-        exp_value = 1  # default
-        
-        for pattern in exp_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                exp_value = int(match.group(1))
-                break
-        
-        return {
-            'id': 'min_experience',
-            'type': 'experience',
-            'label': text,
-            'value': exp_value
-        }
-    
-    # Default: Skill - generate descriptive ID from label
-    # Clean the text to create a skill ID
-    skill_text = text_lower
-    # Remove common prefixes
-    skill_text = re.sub(r'^(must have|nice to have|strong|good|excellent|proficiency in|experience with|knowledge of|familiar with|understanding of)[\s:]+', '', skill_text)
+    return {
+        'id': 'gender',
+        'type': 'gender',
+        'label': text,
+        'value': gender_value
+    }
+
+
+def _classify_age(text, text_lower):
+    age_value = {'min': 18, 'max': 35}  # default
+    
+    for pattern in _AGE_PATTERNS:
+        match = pattern.search(text_lower)
+        if match:
+            if match.lastindex >= 2:
+                age_value = {
+                    'min': int(match.group(1)),
+                    'max': int(match.group(2))
+                }
+            else:
+                age_value = {
+                    'min': 18,
+                    'max': int(match.group(1))
+                }
+            break
+    
+    return {
+        'id': 'age_range',
+        'type': 'age',
+        'label': text,
+        'value': age_value
+    }
+
+
+def _classify_education(text, text_lower):
+    if _BACHELOR_RE.search(text_lower):
+        edu_value = 'bachelor'
+    elif _MASTER_RE.search(text_lower):
+        edu_value = 'master'
+    elif _DIPLOMA_RE.search(text_lower):
+        edu_value = 'diploma'
+    elif _HIGH_SCHOOL_RE.search(text_lower):
+        edu_value = 'high school'
+    else:
+        edu_value = 'bachelor'  # any degree / education mention defaults to bachelor
+    
+    return {
+        'id': 'education',
+        'type': 'education',
+        'label': text,
+        'value': edu_value
+    }
+
+
+def _classify_location(text, text_lower):
+    location_match = _LOCATION_RE.search(text_lower)
+    if location_match:
+        location_value = location_match.group(1).strip()
+        # Remove trailing words like "atau", "dan"
+        location_value = _LOCATION_TAIL_RE.sub('', location_value).strip()
+    else:
+        location_value = 'any'
+    
+    return {
+        'id': 'location',
+        'type': 'location',
+        'label': text,
+        'value': location_value
+    }
+
+
+def _classify_experience(text, text_lower):
+    exp_value = 1  # default
+    
+    for pattern in _EXP_PATTERNS:
+        match = pattern.search(text_lower)
+        if match:
+            exp_value = int(match.group(1))
+            break
+    
+    return {
+        'id': 'min_experience',
+        'type': 'experience',
+        'label': text,
+        'value': exp_value
+    }
+
+
+def _classify_skill(text, text_lower):
+    # Generate descriptive ID from label
+    skill_text = _SKILL_PREFIX_RE.sub('', text_lower)
     # Take first few words and clean
     skill_words = skill_text.split()[:3]  # Take max 3 words
     skill_id = '_'.join(skill_words)
     # Clean special characters
-    skill_id = re.sub(r'[^\w\s]', '', skill_id)
-    skill_id = re.sub(r'\s+', '_', skill_id)
+    skill_id = _NON_WORD_RE.sub('', skill_id)
+    skill_id = _WS_RE.sub('_', skill_id)
     skill_id = f'skill_{skill_id}'
     
     return {
         'id': skill_id,
         'type': 'skill',
         'label': text,
-        'value': text.lower()
+        'value': text_lower
     }
 
 
-def generate_requirements_from_text(job_description, position_title):
-    """Generate requirements in new checklist format"""
+# Priority order, first match wins; anything unmatched is a skill
+_CLASSIFIERS = (
+    (_GENDER_KEYWORDS_RE, _classify_gender),
+    (_AGE_KEYWORDS_RE, _classify_age),
+    (_EDUCATION_KEYWORDS_RE, _classify_education),
+    (_LOCATION_KEYWORDS_RE, _classify_location),
+    (_EXPERIENCE_KEYWORDS_RE, _classify_experience)
+)
+
+
+def classify_requirement(text, req_id):
+    """Classify a single requirement and extract structured value"""
+    text_lower = text.lower()
+    
+    for keywords, classify in _CLASSIFIERS:
+        if keywords.search(text_lower):
+            return classify(text, text_lower)
+    
+    return _classify_skill(text, text_lower)
+
+
+@lru_cache(maxsize=128)
+def _requirements_json(job_description):
+    """Classified requirements array for a job description, as JSON
     
+    Memoized - classification is pure in the text, so re-generating the same
+    job description (UI retries, generate + generate-and-save) is a dict lookup.
+    Stored serialized so every caller gets its own copy to mutate.
+    """
     # Extract bullet points
     bullets = extract_bullet_points(job_description)
     
     # Classify each bullet point
     requirements_array = []
+    seen_ids = set()
     
     # Track counts for generating unique IDs
     type_counts = {
@@ -231,12 +296,11 @@ def generate_requirements_from_text(job_description, position_title):
             elif req_type == 'skill':
                 # ID already generated in classify_requirement, just ensure it's unique
                 base_id = req['id']
-                # Check if this ID already exists
-                existing_ids = [r['id'] for r in requirements_array]
-                if base_id in existing_ids:
+                if base_id in seen_ids:
                     req['id'] = f"{base_id}_{type_counts[req_type]}"
         
         requirements_array.append(req)
+        seen_ids.add(req['id'])
     
     # Add default requirements if none found
     if len(requirements_array) == 0:
@@ -255,13 +319,30 @@ def generate_requirements_from_text(job_description, position_title):
             }
         ]
     
+    return json.dumps(requirements_array)
+
+
+def generate_requirements_from_text(job_description, position_title):
+    """Generate requirements in new checklist format"""
     # Build final output
     return {
         'position': position_title,
-        'requirements': requirements_array
+        'requirements': json.loads(_requirements_json(job_description))
     }
 
 
+def generate_requirements_many(jobs):
+    """Generate requirements for an iterable of (job_description, position_title) pairs
+    
+    Runs every description through the same compiled patterns and classifier
+    table; repeated descriptions in the batch are classified only once.
+    """
+    return [
+        generate_requirements_from_text(job_description, position_title)
+        for job_description, position_title in jobs
+    ]
+
+
 def main():
     print("="*70)
     print("REQUIREMENTS GENERATOR - New Checklist Format")
@@ -279,15 +360,8 @@ def main():
     print("\nPaste job description (press Ctrl+D or Ctrl+Z when done):")
     print("-" * 70)
     
-    lines = []
-    try:
-        while True:
-            line = input()
-            lines.append(line)
-    except EOFError:
-        pass
-    
-    job_description = '\n'.join(lines)
+    # One read of the whole paste instead of an input() call per line
+    job_description = sys.stdin.read()
     
     if not job_description.strip():
         print("\nError: Job description is required!")
@@ -304,13 +378,14 @@ def main():
     print("\n" + "="*70)
     print("GENERATED REQUIREMENTS (Checklist Format)")
     print("="*70)
-    print(json.dumps(requirements, indent=2, ensure_ascii=False))
+    # Serialize once - the same text is displayed and saved
+    requirements_json = json.dumps(requirements, indent=2, ensure_ascii=False)
+    print(requirements_json)
     print("="*70)
     print(f"\nTotal requirements: {len(requirements['requirements'])}")
     
     # Save to file
-    filename_slug = position.lower().replace(' ', '_').replace('-', '_')
-    filename_slug = ''.join(c for c in filename_slug if c.isalnum() or c == '_')
+    filename_slug = _SLUG_RE.sub('', position.lower().replace(' ', '_').replace('-', '_'))
     default_filename = f"{filename_slug}.json"
     
     filename = input(f"\nSave as (default: {default_filename}): ").strip()
@@ -323,8 +398,7 @@ def main():
     filepath = Path('requirements') / filename
     filepath.parent.mkdir(exist_ok=True)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(requirements, f, indent=2, ensure_ascii=False)
+    filepath.write_text(requirements_json, encoding='utf-8')
     
     print(f"\n✓ Saved to: {filepath}")
     print("\nYou can now use this requirements file for scoring!")
@@ -5,7 +5,7 @@ Handles cron-based job scheduling with optimizations
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
-from datetime import datetime
+from datetime import datetime, timezone
 import pytz
 import json
 import random
@@ -20,11 +20,14 @@ class SchedulerService:
     MAX_QUEUE_SIZE = 500  # Don't queue if already 500+ jobs in queue
     MAX_RETRIES = 3  # Retry failed schedule execution
     STAGGER_MAX_DELAY = 30  # Max 30 seconds random delay for concurrent schedules
+    SCHEDULE_CACHE_TTL = 60  # Reuse active schedule rows for 60 seconds
     
     def __init__(self, database):
         self.db = database
         self.scheduler = BackgroundScheduler()
         self.running = False
+        # (fetched_at, rows) - shared by conflict checks instead of one query per job
+        self._active_schedules_cache = None
     
     def start(self):
         """Start the scheduler with proper timezone and event listeners"""
@@ -73,17 +76,25 @@ class SchedulerService:
         for schedule in active_schedules:
             try:
                 print(f"   Loading schedule: {schedule.get('name', 'Unknown')} (ID: {schedule['id']})")
-                self.add_job(schedule['id'])
+                self.add_job(schedule['id'], schedule=schedule)
                 print(f"✓ Loaded schedule: {schedule['name']}")
             except Exception as e:
                 print(f"✗ Failed to load schedule {schedule['name']}: {e}")
     
-    def add_job(self, schedule_id: str):
-        """Add job to scheduler with conflict detection"""
+    def add_job(self, schedule_id: str, schedule: dict = None):
+        """Add job to scheduler with conflict detection
+        
+        Args:
+            schedule_id: Schedule ID
+            schedule: Already-fetched schedule row (skips the lookup)
+        """
         # Use ScheduleManager instead of db to avoid connection issues
         from helper.supabase_helper import ScheduleManager
-         
-        schedule = ScheduleManager.get_by_id(schedule_id)
+        
+        if schedule is None:
+            # Called after a create/update - other schedules may have changed too
+            self._invalidate_schedule_cache()
+            schedule = ScheduleManager.get_by_id(schedule_id)
         if not schedule:
             raise ValueError(f"Schedule {schedule_id} not found")
         
@@ -155,7 +166,7 @@ class SchedulerService:
     def _check_schedule_conflicts(self, schedule_id: str, template_id: str, cron_expression: str):
         """Check for schedule conflicts with same template"""
         # Get all active schedules
-        all_schedules = self.db.get_active_schedules()
+        all_schedules = self._get_active_schedules()
         
         conflicts = []
         for sched in all_schedules:
@@ -204,8 +215,21 @@ class SchedulerService:
             print(f"   LinkedIn activity is lower on weekends")
             print(f"   Consider scheduling on weekdays (1-5) for better results")
     
+    def _get_active_schedules(self):
+        """Get active schedules, re-querying only after SCHEDULE_CACHE_TTL seconds"""
+        cached = self._active_schedules_cache
+        if cached is None or time.monotonic() - cached[0] > self.SCHEDULE_CACHE_TTL:
+            cached = (time.monotonic(), self.db.get_active_schedules())
+            self._active_schedules_cache = cached
+        return cached[1]
+    
+    def _invalidate_schedule_cache(self):
+        """Drop cached schedule rows after a schedule changes"""
+        self._active_schedules_cache = None
+    
     def remove_job(self, schedule_id: str):
         """Remove job from scheduler"""
+        self._invalidate_schedule_cache()
         try:
             self.scheduler.remove_job(schedule_id)
             print(f"✓ Removed job: {schedule_id}")
@@ -395,8 +419,9 @@ class SchedulerService:
         # Update last run timestamp (non-critical, skip if fails)
         try:
             supabase_manager.supabase.table('crawler_schedules').update({
-                'last_run': datetime.now().isoformat()
+                'last_run': datetime.now(timezone.utc).isoformat()
             }).eq('id', schedule_id).execute()
+            self._invalidate_schedule_cache()
         except Exception as e:
             print(f"⚠️ Failed to update last_run (non-critical): {e}")
         
@@ -473,6 +498,9 @@ class SchedulerService:
         
         print(f"📤 Queueing {len(leads_to_queue)} leads in {total_batches} batches...")
         
+        # One timestamp for the whole run instead of one per lead
+        queued_at = datetime.now(timezone.utc).isoformat()
+        
         for i in range(0, len(leads_to_queue), self.BATCH_SIZE):
             batch = leads_to_queue[i:i + self.BATCH_SIZE]
             batch_num = i // self.BATCH_SIZE + 1
@@ -482,7 +510,8 @@ class SchedulerService:
             for lead in batch:
                 success = queue_publisher.publish_crawler_job(
                     profile_url=lead['profile_url'],
-                    template_id=template_id
+                    template_id=template_id,
+                    timestamp=queued_at
                 )
                 if success:
                     queued_count += 1
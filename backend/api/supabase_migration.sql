@@ -112,6 +112,34 @@ CREATE TRIGGER update_schedules_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- ============================================
+-- 5b. leads_list upsert support
+-- ============================================
+-- Crawler saves leads with a single upsert on profile_url
+-- (POST ... Prefer: resolution=merge-duplicates), which needs a unique index.
+-- REQUIRED before deploying the upsert-based crawler/scoring code: without this
+-- index every on_conflict='profile_url' write fails.
+-- The old select-then-insert paths could race and insert the same URL twice, and
+-- the index can't be built over duplicates, so first keep one row per profile_url:
+-- the most complete one (scored, then scraped), most recently processed.
+DELETE FROM leads_list
+WHERE ctid IN (
+    SELECT ctid FROM (
+        SELECT ctid, ROW_NUMBER() OVER (
+            PARTITION BY profile_url
+            ORDER BY (scoring_data IS NOT NULL) DESC,
+                     (profile_data IS NOT NULL) DESC,
+                     processed_at DESC NULLS LAST
+        ) AS duplicate_rank
+        FROM leads_list
+        WHERE profile_url IS NOT NULL
+    ) ranked
+    WHERE duplicate_rank > 1
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_leads_list_profile_url_unique ON leads_list(profile_url);
+-- Upserts don't send `date`, so new rows get it from the default
+ALTER TABLE leads_list ALTER COLUMN date SET DEFAULT CURRENT_DATE;
+
 -- ============================================
 -- 6. Sample Data (Optional - for testing)
 -- ============================================
@@ -5,8 +5,10 @@ import threading
 import time
 import queue
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from crawler import LinkedInCrawler
 from helper.browser_helper import create_driver
+from helper.auth_helper import LOGGED_OUT_MARKERS
 
 
 class BrowserPool:
@@ -16,7 +18,7 @@ class BrowserPool:
         # Get pool size from environment or default to 3
         self.pool_size = pool_size or int(os.getenv('BROWSER_POOL_SIZE', '3'))
         self.available_browsers = queue.Queue(maxsize=self.pool_size)
-        self.busy_browsers = set()
+        self.busy_browsers = {}  # id(browser_info) -> browser_info (dicts aren't hashable)
         self.lock = threading.Lock()
         self.created_count = 0
         self.max_browser_age = int(os.getenv('MAX_BROWSER_AGE_MINUTES', '60'))  # 1 hour
@@ -25,15 +27,24 @@ class BrowserPool:
         self._initialize_pool()
     
     def _initialize_pool(self):
-        """Initialize browser pool with logged-in browsers"""
-        for i in range(self.pool_size):
-            try:
+        """Initialize browser pool with logged-in browsers (launched + logged in concurrently)"""
+        # Each browser is its own WebDriver, so startup/login can overlap;
+        # BROWSER_INIT_WORKERS caps how many launch at once
+        init_workers = max(1, min(self.pool_size, int(os.getenv('BROWSER_INIT_WORKERS', self.pool_size))))
+        
+        with ThreadPoolExecutor(max_workers=init_workers, thread_name_prefix='BrowserInit') as executor:
+            futures = {}
+            for i in range(self.pool_size):
                 print(f"   Creating browser {i+1}/{self.pool_size}...")
-                browser_info = self._create_browser_with_login()
-                self.available_browsers.put(browser_info)
-                print(f"   ✓ Browser {i+1} ready and logged in")
-            except Exception as e:
-                print(f"   ✗ Failed to create browser {i+1}: {e}")
+                futures[executor.submit(self._create_browser_with_login)] = i + 1
+            
+            for future in as_completed(futures):
+                browser_num = futures[future]
+                try:
+                    self.available_browsers.put(future.result())
+                    print(f"   ✓ Browser {browser_num} ready and logged in")
+                except Exception as e:
+                    print(f"   ✗ Failed to create browser {browser_num}: {e}")
         
         print(f"✅ Browser Pool initialized with {self.available_browsers.qsize()} browsers")
     
@@ -61,7 +72,7 @@ class BrowserPool:
             browser_info = self.available_browsers.get(timeout=timeout)
             
             with self.lock:
-                self.busy_browsers.add(browser_info)
+                self.busy_browsers[id(browser_info)] = browser_info
             
             # Check if browser is too old
             age_minutes = (time.time() - browser_info['created_at']) / 60
@@ -82,8 +93,7 @@ class BrowserPool:
         """Return browser to the pool"""
         try:
             with self.lock:
-                if browser_info in self.busy_browsers:
-                    self.busy_browsers.remove(browser_info)
+                self.busy_browsers.pop(id(browser_info), None)
             
             # Check browser health before returning
             if self._is_browser_healthy(browser_info):
@@ -98,14 +108,25 @@ class BrowserPool:
             self._close_browser(browser_info)
     
     def _is_browser_healthy(self, browser_info):
-        """Check if browser is still healthy"""
+        """Check if browser is still healthy (re-logs in place if only the session expired)"""
         try:
             crawler = browser_info['crawler']
             # Simple health check - try to get current URL
             current_url = crawler.driver.current_url
-            return 'linkedin.com' in current_url or current_url == 'data:,'
         except:
             return False
+        
+        if any(marker in current_url for marker in LOGGED_OUT_MARKERS):
+            # Driver is alive - reuse it and just log in again instead of replacing it
+            print("⚠ Browser session expired, re-logging in...")
+            try:
+                crawler.login()
+                return True
+            except Exception as e:
+                print(f"✗ Re-login failed: {e}")
+                return False
+        
+        return 'linkedin.com' in current_url or current_url == 'data:,'
     
     def _refresh_browser(self, browser_info):
         """Refresh browser by re-login"""
@@ -158,7 +179,7 @@ class BrowserPool:
         
         # Close busy browsers
         with self.lock:
-            for browser_info in list(self.busy_browsers):
+            for browser_info in list(self.busy_browsers.values()):
                 self._close_browser(browser_info)
             self.busy_browsers.clear()
         
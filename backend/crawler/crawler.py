@@ -620,11 +620,8 @@ class LinkedInCrawler:
             if not graduation_years:
                 return "Unknown"
             
-            # Sort by year (most recent first)
-            graduation_years.sort(key=lambda x: x['year'], reverse=True)
-            
-            # Use the most recent graduation to estimate age
-            latest_grad = graduation_years[0]
+            # Use the most recent graduation to estimate age (single pass, no sort needed)
+            latest_grad = max(graduation_years, key=lambda x: x['year'])
             grad_year = latest_grad['year']
             degree = latest_grad['degree']
             
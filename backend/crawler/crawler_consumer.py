@@ -1,12 +1,15 @@
 """LinkedIn Profile Scraper with Scoring Integration - Refactored with Helper Modules"""
 import json
 import glob
+import gzip
 import os
+import queue
 import sys
 import threading
 import time
 import pika
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
 from dotenv import load_dotenv
 from crawler import LinkedInCrawler
@@ -31,10 +34,12 @@ except ImportError:
     # Local fallback implementations
     import hashlib
     import threading
+    from functools import lru_cache
     
+    @lru_cache(maxsize=10000)
     def get_profile_hash(profile_url):
-        """Generate unique hash from profile URL"""
-        return hashlib.md5(profile_url.encode()).hexdigest()[:8]
+        """Generate unique hash from profile URL (4-byte BLAKE2b, 8 hex chars)"""
+        return hashlib.blake2b(profile_url.encode(), digest_size=4).hexdigest()
     
     class StatsManager:
         def __init__(self, stats_config=None):
@@ -144,6 +149,20 @@ except ImportError:
                 print(f"[{worker_id}] ⚠ Webhook check failed: {webhook_error}")
                 return False
 
+# Faster serialization of scoring messages (profile_data can be large)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Compact binary scoring messages (opt-in via SCORING_MESSAGE_FORMAT=msgpack)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 try:
     from query_optimizer import QueryOptimizer
     QUERY_OPTIMIZER_AVAILABLE = True
@@ -155,6 +174,8 @@ load_dotenv()
 
 # Configuration
 SCORING_QUEUE = os.getenv('SCORING_QUEUE', 'scoring_queue')
+SCORING_MESSAGE_FORMAT = os.getenv('SCORING_MESSAGE_FORMAT', 'json').lower()
+SCORING_GZIP_MIN_BYTES = int(os.getenv('SCORING_GZIP_MIN_BYTES', '0'))  # 0 = never compress
 REQUIREMENTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scoring', 'requirements')
 DB_CHECK_INTERVAL = int(os.getenv('DB_CHECK_INTERVAL', '60'))  # 1 minute default
 
@@ -166,27 +187,118 @@ stats_manager = StatsManager({
 })
 
 
+# (url, template_id) pairs scraped and saved by this process recently.
+# Overlapping schedule runs can queue the same lead again before the first
+# message is consumed; these are skipped without a Supabase lookup. Entries
+# expire after COMPLETED_URL_TTL seconds (oldest evicted past COMPLETED_URL_MAX)
+# so a deliberate re-scrape later in the session goes through.
+COMPLETED_URL_TTL = int(os.getenv('COMPLETED_URL_TTL', '600'))  # 10 minutes default
+COMPLETED_URL_MAX = 10000
+completed_urls = OrderedDict()  # (url, template_id) -> completed_at, oldest first
+completed_urls_lock = threading.Lock()
+
+
+def mark_url_completed(profile_url, template_id):
+    """Remember a successfully scraped + saved profile URL for a template"""
+    key = (profile_url, template_id)
+    with completed_urls_lock:
+        completed_urls.pop(key, None)
+        completed_urls[key] = time.monotonic()
+        while len(completed_urls) > COMPLETED_URL_MAX:
+            completed_urls.popitem(last=False)
+
+
+def is_url_completed(profile_url, template_id):
+    """True if this URL was scraped for this template within COMPLETED_URL_TTL"""
+    key = (profile_url, template_id)
+    with completed_urls_lock:
+        completed_at = completed_urls.get(key)
+        if completed_at is None:
+            return False
+        if time.monotonic() - completed_at < COMPLETED_URL_TTL:
+            return True
+        del completed_urls[key]
+        return False
+
+
+# Complete leads pre-fetched per template with one paged query, so workers can
+# skip them without a SELECT per profile URL. A miss is not proof the lead is
+# absent (newer insert, other template, incomplete data) and falls back to the
+# per-URL lookup.
+EXISTING_LEADS_TTL = int(os.getenv('EXISTING_LEADS_TTL', '300'))  # 5 minutes default
+existing_leads_cache = {}  # template_id -> (fetched_at, {profile_url: lead})
+existing_leads_refreshing = set()  # template_ids being fetched right now
+existing_leads_lock = threading.Lock()
+
+
+def get_existing_leads_map(supabase, template_id):
+    """Get cached {profile_url: lead} map of complete leads, re-fetching when stale
+    
+    The fetch runs outside the lock; while one worker refreshes a template the
+    others keep using the previous map (or an empty one on first load).
+    """
+    with existing_leads_lock:
+        cached = existing_leads_cache.get(template_id)
+        if cached and time.monotonic() - cached[0] < EXISTING_LEADS_TTL:
+            return cached[1]
+        if template_id in existing_leads_refreshing:
+            return cached[1] if cached else {}
+        existing_leads_refreshing.add(template_id)
+
+    try:
+        leads_map = supabase.get_existing_leads_map(template_id)
+    finally:
+        with existing_leads_lock:
+            existing_leads_refreshing.discard(template_id)
+
+    with existing_leads_lock:
+        existing_leads_cache[template_id] = (time.monotonic(), leads_map)
+    print(f"📦 Pre-fetched {len(leads_map)} complete leads for template {template_id}")
+    return leads_map
+
+
+# output_dir -> {profile_url: filepath}, built by reading every saved JSON once
+# and kept current by save_profile_data, so a miss never rescans the directory
+crawled_file_index = {}
+crawled_file_index_lock = threading.Lock()
+
+
+def get_crawled_file_index(output_dir):
+    """Get the {profile_url: filepath} index for output_dir, building it on first use"""
+    with crawled_file_index_lock:
+        index = crawled_file_index.get(output_dir)
+        if index is None:
+            index = {}
+            for filepath in glob.glob(os.path.join(output_dir, "*.json")):
+                try:
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        url = json.load(f).get('profile_url')
+                    if url:
+                        index.setdefault(url, filepath)
+                except:
+                    continue
+            crawled_file_index[output_dir] = index
+        return index
+
+
 def check_if_already_crawled(profile_url, output_dir='data/output'):
     """Check if profile URL has already been crawled"""
     if not os.path.exists(output_dir):
         return False, None
     
     url_hash = get_profile_hash(profile_url)
-    pattern = os.path.join(output_dir, f"*_{url_hash}.json")
-    existing_files = glob.glob(pattern)
     
-    if existing_files:
-        return True, existing_files[0]
+    # Look for a file named *_{url_hash}.json straight off the directory iterator
+    suffix = f"_{url_hash}.json"
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(suffix) and not entry.name.startswith('.'):
+                return True, entry.path
     
-    all_files = glob.glob(os.path.join(output_dir, "*.json"))
-    for filepath in all_files:
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if data.get('profile_url') == profile_url:
-                    return True, filepath
-        except:
-            continue
+    # Not in the index = definitely not saved (no per-file reads on a miss)
+    filepath = get_crawled_file_index(output_dir).get(profile_url)
+    if filepath:
+        return True, filepath
     
     return False, None
 
@@ -219,6 +331,9 @@ def save_profile_data(profile_data, output_dir='data/output'):
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(profile_data, indent=2, ensure_ascii=False, fp=f)
     
+    if profile_url:
+        get_crawled_file_index(output_dir)[profile_url] = filepath
+    
     print(f"\n✓ Profile data saved to: {filepath}")
     return filepath
 
@@ -362,12 +477,15 @@ def queue_leads_by_template(template_id, mq_config):
         
         queued_count = 0
         
+        # One timestamp for the whole run instead of one per lead
+        queued_at = datetime.now(timezone.utc).isoformat()
+        
         try:
             for lead in needs_processing:
                 message = {
                     'url': lead['profile_url'],
                     'template_id': template_id,
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': queued_at,
                     'trigger': 'template_selection',
                     'lead_id': lead['id'],
                     'reason': ', '.join(lead['status_reason'])
@@ -401,49 +519,184 @@ def queue_leads_by_template(template_id, mq_config):
         return 0
 
 
-def send_to_scoring_queue(profile_data, template_id, mq_config):
-    """Send profile data to scoring queue"""
-    try:
-        # Connect to RabbitMQ
-        mq = RabbitMQManager()
-        mq.host = mq_config['host']
-        mq.port = mq_config['port']
-        mq.username = mq_config['username']
-        mq.password = mq_config['password']
-        mq.queue_name = SCORING_QUEUE
-        
-        if not mq.connect():
-            print(f"  ✗ Failed to connect to scoring queue")
-            return False
+# Scoring-queue connection, owned by the background publisher thread (the only
+# thread that publishes to scoring). Reused across batches instead of
+# reconnecting per publish.
+_scoring_mq = None
+
+
+def _get_scoring_mq(mq_config):
+    """The publisher's scoring-queue connection, connecting on first use"""
+    global _scoring_mq
+    mq = _scoring_mq
+    if mq and mq.connection and mq.connection.is_open and mq.channel.is_open:
+        return mq
+    
+    # Connect to RabbitMQ (connect() declares the durable scoring queue once)
+    mq = RabbitMQManager()
+    mq.host = mq_config['host']
+    mq.port = mq_config['port']
+    mq.username = mq_config['username']
+    mq.password = mq_config['password']
+    mq.queue_name = SCORING_QUEUE
+    
+    if not mq.connect():
+        return None
+    
+    _scoring_mq = mq
+    return mq
+
+
+def _drop_scoring_mq():
+    """Close and forget the publisher's scoring-queue connection"""
+    global _scoring_mq
+    mq, _scoring_mq = _scoring_mq, None
+    if mq:
+        mq.close()
+
+
+def encode_scoring_message(message):
+    """Serialize a scoring message, returning (body, content_type, content_encoding)
+    
+    Bodies of at least SCORING_GZIP_MIN_BYTES are gzipped at level 1 (cheap on CPU,
+    profile JSON still shrinks several times).
+    """
+    if SCORING_MESSAGE_FORMAT == 'msgpack' and MSGPACK_AVAILABLE:
+        body, content_type = msgpack.packb(message, use_bin_type=True), 'application/msgpack'
+    elif ORJSON_AVAILABLE:
+        body, content_type = orjson.dumps(message), 'application/json'
+    else:
+        body, content_type = json.dumps(message).encode('utf-8'), 'application/json'
+    
+    if SCORING_GZIP_MIN_BYTES and len(body) >= SCORING_GZIP_MIN_BYTES:
+        return gzip.compress(body, compresslevel=1), content_type, 'gzip'
+    return body, content_type, None
+
+
+def send_batch_to_scoring_queue(items, mq_config):
+    """Send (profile_data, template_id) pairs to the scoring queue over one connection
+    
+    Runs on the publisher thread and reuses its connection; a dropped one is re-opened
+    once and the remaining items are retried. Items that can't be encoded are
+    logged and dropped rather than retried.
+    Returns the number of leading items handled (published or dropped).
+    """
+    if not items:
+        return 0
+    
+    handled = sent = 0
+    for attempt in range(2):
+        try:
+            mq = _get_scoring_mq(mq_config)
+            if not mq:
+                print(f"  ✗ Failed to connect to scoring queue")
+                break
+            
+            for profile_data, template_id in items[handled:]:
+                try:
+                    message = {
+                        'profile_data': profile_data,
+                        'template_id': template_id,  # Use template_id instead of requirements_id
+                        'profile_url': profile_data.get('profile_url', '')
+                    }
+                    body, content_type, content_encoding = encode_scoring_message(message)
+                except Exception as e:
+                    print(f"  ✗ Dropping unencodable scoring message ({type(e).__name__}): {e}")
+                    handled += 1
+                    continue
+                
+                mq.channel.basic_publish(
+                    exchange='',
+                    routing_key=SCORING_QUEUE,
+                    body=body,
+                    properties=pika.BasicProperties(
+                        delivery_mode=2,  # Make message persistent
+                        content_type=content_type,
+                        content_encoding=content_encoding
+                    )
+                )
+                stats_manager.increment('sent_to_scoring')
+                handled += 1
+                sent += 1
+            break
+        except pika.exceptions.AMQPError as e:
+            _drop_scoring_mq()
+            if attempt == 0:
+                print(f"  ⚠ Scoring queue connection lost ({e}), reconnecting...")
+            else:
+                print(f"  ✗ Failed to send to scoring queue: {e}")
+        except Exception as e:
+            print(f"  ✗ Failed to send to scoring queue: {e}")
+            break
+    
+    if sent:
+        print(f"  📤 Sent {sent} profile(s) to scoring queue: {SCORING_QUEUE}")
+    return handled
+
+
+# Fire-and-forget hand-off: workers enqueue scraped profiles and go back to
+# scraping; one publisher thread drains whatever has piled up into a batch.
+_scoring_outbox = queue.Queue()
+_scoring_publisher = None
+_scoring_publisher_lock = threading.Lock()
+SCORING_RETRY_DELAY = 5  # seconds before re-sending profiles a failed batch left behind
+
+
+def _scoring_publisher_loop(mq_config):
+    """Publish queued profiles until the stop sentinel (None) arrives
+    
+    Profiles a failed batch couldn't publish (connection trouble) stay pending
+    and go out with the next batch instead of being dropped.
+    """
+    pending = []
+    stopping = False
+    while not stopping:
+        try:
+            # With a backlog, don't wait for new work longer than the retry delay
+            items = [_scoring_outbox.get(timeout=SCORING_RETRY_DELAY if pending else None)]
+        except queue.Empty:
+            items = []
+        while True:
+            try:
+                items.append(_scoring_outbox.get_nowait())
+            except queue.Empty:
+                break
         
-        # Prepare message
-        message = {
-            'profile_data': profile_data,
-            'template_id': template_id,  # Use template_id instead of requirements_id
-            'profile_url': profile_data.get('profile_url', '')
-        }
-        
-        # Publish to scoring queue
-        mq.channel.queue_declare(queue=SCORING_QUEUE, durable=True)
-        mq.channel.basic_publish(
-            exchange='',
-            routing_key=SCORING_QUEUE,
-            body=json.dumps(message),
-            properties=pika.BasicProperties(
-                delivery_mode=2,  # Make message persistent
-            )
-        )
+        if None in items:
+            stopping = True
+            items = [item for item in items if item is not None]
         
-        mq.close()
-        print(f"  📤 Sent to scoring queue: {SCORING_QUEUE}")
-        return True
+        pending.extend(items)
+        del pending[:send_batch_to_scoring_queue(pending, mq_config)]
     
-    except Exception as e:
-        print(f"  ✗ Failed to send to scoring queue: {e}")
-        return False
+    if pending:
+        print(f"  ✗ {len(pending)} profile(s) could not be sent to scoring queue")
+    _drop_scoring_mq()
+
 
+def queue_for_scoring(profile_data, template_id, mq_config):
+    """Hand a scraped profile to the background scoring publisher"""
+    global _scoring_publisher
+    with _scoring_publisher_lock:
+        if _scoring_publisher is None:
+            _scoring_publisher = threading.Thread(
+                target=_scoring_publisher_loop,
+                args=(mq_config,),
+                daemon=True,
+                name="ScoringPublisher"
+            )
+            _scoring_publisher.start()
+    _scoring_outbox.put((profile_data, template_id))
 
 
+def stop_scoring_publisher(timeout=30):
+    """Flush pending scoring messages and stop the publisher thread"""
+    global _scoring_publisher
+    with _scoring_publisher_lock:
+        publisher, _scoring_publisher = _scoring_publisher, None
+    if publisher:
+        _scoring_outbox.put(None)
+        publisher.join(timeout)
 
 
 def process_profile_message(worker_id, message, supabase, mq_config):
@@ -465,9 +718,15 @@ def process_profile_message(worker_id, message, supabase, mq_config):
         
         stats_manager.increment('processing')
         
+        # Already scraped by this process (duplicate message) - skip without a DB hit
+        if is_url_completed(url, template_id):
+            print(f"[Worker {worker_id}] ⊘ Already scraped in this session")
+            stats_manager.increment('skipped')
+            return True
+        
         # Check if already scraped in Supabase - OPTIMIZED
         if supabase:
-            existing_lead = get_existing_lead_optimized(supabase, url)
+            existing_lead = get_existing_lead_optimized(supabase, url, template_id)
             
             if existing_lead:
                 should_skip, reason = ProfileValidator.should_skip_processing(existing_lead)
@@ -498,10 +757,9 @@ def process_profile_message(worker_id, message, supabase, mq_config):
         if supabase:
             update_supabase_result(worker_id, supabase, url, profile_data, template_id)
         
-        # Send to scoring queue
-        print(f"[Worker {worker_id}] 📤 Sending to scoring...")
-        if send_to_scoring_queue(profile_data, template_id, mq_config):
-            stats_manager.increment('sent_to_scoring')
+        # Send to scoring queue (published in the background)
+        print(f"[Worker {worker_id}] 📤 Queued for scoring")
+        queue_for_scoring(profile_data, template_id, mq_config)
         
         stats_manager.increment('completed')
         print(f"[Worker {worker_id}] ✓ Completed: {profile_data.get('name', 'Unknown')}")
@@ -527,8 +785,16 @@ def process_profile_message(worker_id, message, supabase, mq_config):
         stats_manager.decrement('processing')
 
 
-def get_existing_lead_optimized(supabase, url):
+def get_existing_lead_optimized(supabase, url, template_id=None):
     """Get existing lead with query optimization if available"""
+    if template_id and hasattr(supabase, 'get_existing_leads_map'):
+        try:
+            lead = get_existing_leads_map(supabase, template_id).get(url)
+            if lead:
+                return lead
+        except Exception as e:
+            print(f"⚠ Lead pre-fetch failed, falling back to per-URL lookup: {e}")
+    
     if QUERY_OPTIMIZER_AVAILABLE and hasattr(supabase, 'client'):
         try:
             optimizer = QueryOptimizer(supabase.client)
@@ -546,6 +812,7 @@ def update_supabase_result(worker_id, supabase, url, profile_data, template_id):
     
     if supabase.update_lead_after_scrape(profile_url=url, profile_data=profile_data):
         stats_manager.increment('saved_to_supabase')
+        mark_url_completed(url, template_id)
         print(f"[Worker {worker_id}] ✓ Updated Supabase")
         
         # Check webhook completion using pooled connection
@@ -815,6 +1082,7 @@ def cleanup_pools():
     try:
         cleanup_browser_pool()
         cleanup_connection_pool()
+        stop_scoring_publisher()
         print("✓ All pools cleaned up")
     except Exception as e:
         print(f"⚠ Error during cleanup: {e}")
@@ -13,7 +13,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from helper.rabbitmq_helper import RabbitMQManager, ack_message, nack_message
 from helper.supabase_helper import SupabaseManager
 from helper.browser_helper import create_driver, human_delay
-from helper.auth_helper import login
+from helper.auth_helper import login, LOGGED_OUT_MARKERS
 
 load_dotenv()
 
@@ -609,9 +609,60 @@ def send_connection_request(driver, profile_url, lead_name, message_template, dr
         return result
 
 
-def process_outreach_job(message_data, dry_run=True):
-    """Process a single outreach job"""
-    driver = None
+def _quit_driver(driver):
+    """Quit a driver, ignoring errors from an already dead browser"""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def get_healthy_driver(driver=None):
+    """Return driver if it is alive and still logged in to LinkedIn, otherwise a fresh logged-in one
+    
+    A warm driver sitting on a login/checkpoint page is logged in again instead
+    of being reused logged out.
+    """
+    if driver is not None:
+        try:
+            current_url = driver.current_url  # Raises if the browser/session is gone
+        except Exception:
+            print("⚠ Browser session lost, restarting browser...")
+            _quit_driver(driver)
+        else:
+            if not any(marker in current_url for marker in LOGGED_OUT_MARKERS):
+                return driver
+            print("⚠ LinkedIn session expired, re-logging in...")
+            try:
+                login(driver)
+                return driver
+            except Exception as e:
+                print(f"✗ Re-login failed ({e}), restarting browser...")
+                _quit_driver(driver)
+    
+    print("🌐 Starting browser...")
+    driver = create_driver(mobile_mode=False)
+    
+    print("🔐 Logging in...")
+    try:
+        login(driver)
+    except Exception:
+        # Don't leak the new browser when login fails
+        _quit_driver(driver)
+        raise
+    return driver
+
+
+def process_outreach_job(message_data, dry_run=True, driver=None):
+    """Process a single outreach job
+    
+    Args:
+        message_data: Outreach job payload
+        dry_run: Don't actually send the connection request
+        driver: Logged-in driver to reuse. If None, a browser is created
+            for this job and closed afterwards.
+    """
+    owns_driver = driver is None
     
     try:
         # Parse message
@@ -627,13 +678,9 @@ def process_outreach_job(message_data, dry_run=True):
         personalized_message = message_template.replace('{lead_name}', lead_name)
         personalized_message = personalized_message.replace('[lead_name]', lead_name)
         
-        # Create browser
-        print("🌐 Starting browser...")
-        driver = create_driver(mobile_mode=False)
-        
-        # Login
-        print("🔐 Logging in...")
-        login(driver)
+        # Create browser + login (only when no warm driver was passed in)
+        if owns_driver:
+            driver = get_healthy_driver()
         
         # Send connection request
         result = send_connection_request(
@@ -683,7 +730,7 @@ def process_outreach_job(message_data, dry_run=True):
         return result
     
     finally:
-        if driver:
+        if driver and owns_driver:
             print("🔒 Closing browser...")
             driver.quit()
 
@@ -714,8 +761,12 @@ def worker_thread(worker_id, outreach_queue):
     # Set QoS - process 1 at a time per worker
     mq.channel.basic_qos(prefetch_count=1)
     
+    # Warm logged-in browser reused across jobs (created on first job)
+    worker_driver = None
+    
     def callback(ch, method, properties, body):
         """Process each outreach job"""
+        nonlocal worker_driver
         try:
             print(f"\n[Worker {worker_id}] " + "="*60)
             print(f"[Worker {worker_id}] 📥 NEW JOB RECEIVED")
@@ -733,8 +784,9 @@ def worker_thread(worker_id, outreach_queue):
             print(f"[Worker {worker_id}] Mode: {'🧪 DRY RUN (testing)' if dry_run else '🔴 LIVE (real send)'}")
             print(f"[Worker {worker_id}] " + "="*60)
             
-            # Process job
-            result = process_outreach_job(message_data, dry_run=dry_run)
+            # Process job with the worker's warm browser
+            worker_driver = get_healthy_driver(worker_driver)
+            result = process_outreach_job(message_data, dry_run=dry_run, driver=worker_driver)
             
             # Log result
             print(f"\n[Worker {worker_id}] " + "="*60)
@@ -793,6 +845,12 @@ def worker_thread(worker_id, outreach_queue):
         traceback.print_exc()
     
     finally:
+        if worker_driver:
+            print(f"[Worker {worker_id}] 🔒 Closing browser...")
+            try:
+                worker_driver.quit()
+            except Exception:
+                pass
         mq.close()
         print(f"[Worker {worker_id}] ✓ Stopped")
 
@@ -26,6 +26,9 @@ load_dotenv()
 SEARCH_QUEUE = os.getenv('SEARCH_QUEUE', 'linkedin_search_queue')
 MAX_WORKERS = int(os.getenv('MAX_WORKERS', '3'))
 
+# Sentinel for entry.get() - tells a missing 'name' key apart from a None value
+_MISSING = object()
+
 
 class LinkedInSearchCrawler:
     """Crawler untuk mencari profil LinkedIn berdasarkan nama"""
@@ -227,16 +230,16 @@ class LinkedInSearchCrawler:
                 print(f"\n[{idx}/{len(data)}] Processing entry:")
                 
                 # Validasi entry memiliki field 'name'
-                if 'name' not in entry:
+                name = entry.get('name', _MISSING)
+                if name is _MISSING:
                     print("  ⚠ Skipping: No 'name' field")
                     entry['profile_url'] = None
                     continue
                 
-                name = entry['name']
-                
                 # Skip jika sudah ada profile_url
-                if 'profile_url' in entry and entry['profile_url']:
-                    print(f"  ℹ Already has profile_url: {entry['profile_url']}")
+                existing_url = entry.get('profile_url')
+                if existing_url:
+                    print(f"  ℹ Already has profile_url: {existing_url}")
                     continue
                 
                 # Search profile
@@ -300,8 +303,16 @@ class LinkedInSearchCrawler:
     def _print_summary(self, data):
         """Print summary hasil processing"""
         total = len(data)
-        found = sum(1 for entry in data if entry.get('profile_url'))
-        not_found = total - found
+        
+        # Single pass - collect entries without a URL while counting
+        missing_names = []
+        append_missing = missing_names.append
+        for entry in data:
+            if not entry.get('profile_url'):
+                append_missing(entry.get('name', 'N/A'))
+        
+        not_found = len(missing_names)
+        found = total - not_found
         
         print("\nSummary:")
         print(f"  Total entries: {total}")
@@ -310,9 +321,8 @@ class LinkedInSearchCrawler:
         
         if not_found > 0:
             print("\nEntries without LinkedIn URL:")
-            for entry in data:
-                if not entry.get('profile_url'):
-                    print(f"  - {entry.get('name', 'N/A')}")
+            for name in missing_names:
+                print(f"  - {name}")
     
     def close(self):
         """Close browser"""
@@ -382,17 +392,19 @@ def send_to_queue(json_file):
         
         # Send jobs
         sent = 0
+        total = len(data)
         for idx, entry in enumerate(data, 1):
-            if 'name' not in entry:
-                print(f"[{idx}/{len(data)}] ⚠ Skipping: No 'name' field")
+            name = entry.get('name', _MISSING)
+            if name is _MISSING:
+                print(f"[{idx}/{total}] ⚠ Skipping: No 'name' field")
                 continue
             
             if entry.get('profile_url'):
-                print(f"[{idx}/{len(data)}] ⚠ Skipping: {entry['name']} (already has URL)")
+                print(f"[{idx}/{total}] ⚠ Skipping: {name} (already has URL)")
                 continue
             
             job = {
-                'name': entry['name'],
+                'name': name,
                 'index': idx - 1,
                 'source_file': json_file
             }
@@ -407,7 +419,7 @@ def send_to_queue(json_file):
             )
             
             sent += 1
-            print(f"[{idx}/{len(data)}] ✓ Sent: {entry['name']}")
+            print(f"[{idx}/{total}] ✓ Sent: {name}")
         
         rabbitmq.close()
         
@@ -12,6 +12,26 @@ from .browser_helper import human_delay
 
 COOKIES_FILE = "data/cookie/.linkedin_cookies.json"
 
+# URL fragments LinkedIn redirects to once a session has expired
+LOGGED_OUT_MARKERS = ('/login', '/authwall', '/checkpoint', '/uas/')
+
+# Parsed cookies shared by every driver in this process: (mtime, cookies)
+_cookie_cache = None
+
+
+def _read_cookies():
+    """Read cookies file, re-parsing only when its mtime changes"""
+    global _cookie_cache
+    mtime = os.stat(COOKIES_FILE).st_mtime
+    cache = _cookie_cache
+    if cache and cache[0] == mtime:
+        return cache[1]
+    
+    with open(COOKIES_FILE, 'r') as f:
+        cookies = json.load(f)
+    _cookie_cache = (mtime, cookies)
+    return cookies
+
 
 def save_cookies(driver):
     """Save cookies to JSON file for session persistence"""
@@ -34,8 +54,7 @@ def load_cookies(driver):
         driver.get('https://www.linkedin.com')
         human_delay(2, 3)
         
-        with open(COOKIES_FILE, 'r') as f:
-            cookies = json.load(f)
+        cookies = _read_cookies()
         
         for cookie in cookies:
             try:
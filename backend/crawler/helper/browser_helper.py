@@ -1,63 +1,208 @@
 """Browser automation helper functions"""
 import time
 import random
+import logging
+import socket
+import threading
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import os
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.action_chains import ActionChains
 
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name, default):
+    """Read a float env var, falling back to default if unset or invalid"""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("Invalid %s=%r, using default %s", name, value, default)
+        return default
+
+
 # Load delay configuration from environment
-try:
-    MIN_DELAY = float(os.getenv('MIN_DELAY'))
-    MAX_DELAY = float(os.getenv('MAX_DELAY'))
-    PROFILE_DELAY_MIN = float(os.getenv('PROFILE_DELAY_MIN'))
-    PROFILE_DELAY_MAX = float(os.getenv('PROFILE_DELAY_MAX'))
-    USE_MOBILE_MODE = os.getenv('USE_MOBILE_MODE').lower() == 'true'
-except:
-    MIN_DELAY = 2.0
-    MAX_DELAY = 5.0
-    PROFILE_DELAY_MIN = 10.0
-    PROFILE_DELAY_MAX = 20.0
-    USE_MOBILE_MODE = False
-
-
-def create_driver(mobile_mode=None):
-    """Create and configure Chrome driver with anti-detection"""
-    if mobile_mode is None:
-        mobile_mode = USE_MOBILE_MODE
-    
-    options = webdriver.ChromeOptions()
-    
-    # Check if running in production (Docker/Render)
-    is_production = os.getenv('RENDER', 'false').lower() == 'true' or os.getenv('DOCKER', 'false').lower() == 'true'
+MIN_DELAY = _env_float('MIN_DELAY', 2.0)
+MAX_DELAY = _env_float('MAX_DELAY', 5.0)
+PROFILE_DELAY_MIN = _env_float('PROFILE_DELAY_MIN', 10.0)
+PROFILE_DELAY_MAX = _env_float('PROFILE_DELAY_MAX', 20.0)
+USE_MOBILE_MODE = os.getenv('USE_MOBILE_MODE', 'false').lower() == 'true'
+
+# Precomputed delay spans: delay = MIN + SPAN * random()
+_DELAY_SPAN = MAX_DELAY - MIN_DELAY
+_PROFILE_DELAY_SPAN = PROFILE_DELAY_MAX - PROFILE_DELAY_MIN
+_rand = random.random
+_randint = random.randint
+
+# Persistent Chrome profiles keep disk/HTTP/JS caches warm between runs
+PERSIST_CHROME_PROFILE = os.getenv('PERSIST_CHROME_PROFILE', 'true').lower() == 'true'
+CHROME_PROFILE_ROOT = os.getenv(
+    'CHROME_PROFILE_DIR',
+    os.path.expanduser('~/.cache/scrapper-dashboard/chrome-profile')
+)
+
+# Serializes profile slot selection + Chrome launch so two threads never pick the same slot
+_profile_lock = threading.Lock()
+
+
+@contextmanager
+def _profile_claim():
+    """Hold the slot-claim lock across threads and, where flock exists, across processes"""
+    with _profile_lock:
+        if not (PERSIST_CHROME_PROFILE and FCNTL_AVAILABLE):
+            yield
+            return
+        os.makedirs(CHROME_PROFILE_ROOT, exist_ok=True)
+        with open(os.path.join(CHROME_PROFILE_ROOT, '.claim.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _singleton_lock_is_stale(lock_path):
+    """True if a SingletonLock points at a dead Chrome on this host (left by a crash)"""
+    try:
+        target = os.readlink(lock_path)  # "<hostname>-<pid>"
+    except OSError:
+        return False
+    host, _, pid = target.rpartition('-')
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+def _claim_profile_dir():
+    """Return the first profile slot of this worker not locked by a running Chrome
     
+    Locks left by a crashed Chrome are cleared so the slot is reused instead of
+    leaking a new profile directory per crash.
+    """
+    worker_id = os.getenv('WORKER_ID', 'default')
+    slot = 0
+    while True:
+        path = os.path.join(CHROME_PROFILE_ROOT, f'{worker_id}-{slot}')
+        lock_path = os.path.join(path, 'SingletonLock')
+        if os.path.lexists(lock_path) and _singleton_lock_is_stale(lock_path):
+            logger.info("Removing stale Chrome lock in %s", path)
+            for name in ('SingletonLock', 'SingletonSocket', 'SingletonCookie'):
+                try:
+                    os.unlink(os.path.join(path, name))
+                except OSError:
+                    pass
+        in_use = (
+            os.path.lexists(lock_path) or
+            os.path.exists(os.path.join(path, 'lockfile'))
+        )
+        if not in_use:
+            os.makedirs(path, exist_ok=True)
+            return path
+        slot += 1
+
+
+# Static driver configuration, built once per process
+IS_PRODUCTION = os.getenv('RENDER', 'false').lower() == 'true' or os.getenv('DOCKER', 'false').lower() == 'true'
+
+MOBILE_USER_AGENTS = (
+    'Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Linux; Android 12; SM-S906N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Mobile Safari/537.36',
+)
+
+DESKTOP_USER_AGENTS = (
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
+)
+
+_BASE_ARGUMENTS = (
     # Anti-detection: Hide automation flags
-    options.add_argument('--disable-blink-features=AutomationControlled')
+    '--disable-blink-features=AutomationControlled',
+    # Stealth mode
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-gpu',
+    '--lang=en-US',
+) + (
+    # Production mode: headless (new headless mode is more stable)
+    ('--headless=new', '--disable-software-rasterizer') if IS_PRODUCTION else ()
+)
+
+# Injected via CDP so it runs before any site script on every new document
+_ANTI_DETECT_JS = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+    Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+    window.chrome = {runtime: {}};
+"""
+
+
+def _base_options(load_images=False):
+    """Fresh ChromeOptions with all per-process static settings applied"""
+    options = webdriver.ChromeOptions()
+    for argument in _BASE_ARGUMENTS:
+        options.add_argument(argument)
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
     
-    # Stealth mode
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-gpu')
+    prefs = {
+        'intl.accept_languages': 'en-US,en',
+        'profile.default_content_setting_values.notifications': 2,
+    }
+    if not load_images:
+        # Scraping never reads images - skip them to cut page bytes
+        prefs['profile.managed_default_content_settings.images'] = 2
+    options.add_experimental_option('prefs', prefs)
     
-    # Production mode: headless
-    if is_production:
-        options.add_argument('--headless=new')  # New headless mode (more stable)
-        options.add_argument('--disable-software-rasterizer')
-        print("🔧 Running in HEADLESS mode (production)")
+    # Return after DOMContentLoaded instead of waiting for every subresource
+    options.page_load_strategy = 'eager'
+    return options
+
+
+def create_driver(mobile_mode=None, load_images=False):
+    """Create and configure Chrome driver with anti-detection
     
-    # User agent and window size
+    Args:
+        mobile_mode: Use mobile emulation (defaults to USE_MOBILE_MODE)
+        load_images: Load images (only needed for manual login / CAPTCHA)
+    """
+    if mobile_mode is None:
+        mobile_mode = USE_MOBILE_MODE
+    
+    options = _base_options(load_images)
+    
+    if IS_PRODUCTION:
+        logger.info("Running in HEADLESS mode (production)")
+    
+    # User agent and window size - the only per-call randomization
     if mobile_mode:
-        mobile_user_agents = [
-            'Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36',
-            'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1',
-            'Mozilla/5.0 (Linux; Android 12; SM-S906N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Mobile Safari/537.36',
-        ]
-        selected_ua = random.choice(mobile_user_agents)
+        selected_ua = random.choice(MOBILE_USER_AGENTS)
         options.add_argument(f'user-agent={selected_ua}')
         options.add_argument('--window-size=412,915')
         mobile_emulation = {
@@ -65,80 +210,71 @@ def create_driver(mobile_mode=None):
             "userAgent": selected_ua
         }
         options.add_experimental_option("mobileEmulation", mobile_emulation)
-        print("🔧 Using MOBILE mode (412x915)")
+        logger.info("Using MOBILE mode (412x915)")
     else:
-        user_agents = [
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
-        ]
-        selected_ua = random.choice(user_agents)
+        selected_ua = random.choice(DESKTOP_USER_AGENTS)
         options.add_argument(f'user-agent={selected_ua}')
         options.add_argument('--window-size=1920,1080')
         options.add_argument('--start-maximized')
-        print("🔧 Using DESKTOP mode (1920x1080)")
-    
-    options.add_argument('--lang=en-US')
-    options.add_experimental_option('prefs', {'intl.accept_languages': 'en-US,en'})
+        logger.info("Using DESKTOP mode (1920x1080)")
     
     driver = None
-    try:
-        service = ChromeService()
-        driver = webdriver.Chrome(service=service, options=options)
-        print("✓ Using Selenium auto-managed ChromeDriver")
-    except Exception as e:
-        print(f"⚠ Selenium auto-download failed: {e}")
+    with _profile_claim():
+        if PERSIST_CHROME_PROFILE:
+            profile_dir = _claim_profile_dir()
+            options.add_argument(f'--user-data-dir={profile_dir}')
+            options.add_argument(f'--disk-cache-dir={os.path.join(profile_dir, "cache")}')
+            options.add_argument('--profile-directory=Default')
+            logger.info("Using Chrome profile: %s", profile_dir)
+        
         try:
-            print("  Trying webdriver-manager...")
-            from webdriver_manager.chrome import ChromeDriverManager
-            import shutil
-            cache_path = os.path.expanduser("~/.wdm")
-            if os.path.exists(cache_path):
-                shutil.rmtree(cache_path, ignore_errors=True)
-            driver_path = ChromeDriverManager().install()
-            service = ChromeService(executable_path=driver_path)
+            service = ChromeService()
             driver = webdriver.Chrome(service=service, options=options)
-            print("✓ Using webdriver-manager ChromeDriver")
-        except:
-            raise Exception("Failed to create ChromeDriver")
+            logger.info("Using Selenium auto-managed ChromeDriver")
+        except Exception as e:
+            logger.warning("Selenium auto-download failed: %s", e)
+            try:
+                logger.info("Trying webdriver-manager...")
+                from webdriver_manager.chrome import ChromeDriverManager
+                import shutil
+                cache_path = os.path.expanduser("~/.wdm")
+                if os.path.exists(cache_path):
+                    shutil.rmtree(cache_path, ignore_errors=True)
+                driver_path = ChromeDriverManager().install()
+                service = ChromeService(executable_path=driver_path)
+                driver = webdriver.Chrome(service=service, options=options)
+                logger.info("Using webdriver-manager ChromeDriver")
+            except:
+                raise Exception("Failed to create ChromeDriver")
     
     if driver is None:
         raise Exception("Failed to create ChromeDriver")
     
     # Anti-detection scripts
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': _ANTI_DETECT_JS})
     driver.execute_cdp_cmd('Network.setUserAgentOverride', {
         "userAgent": 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     })
-    driver.execute_script("""
-        Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-        Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-        const originalQuery = window.navigator.permissions.query;
-        window.navigator.permissions.query = (parameters) => (
-            parameters.name === 'notifications' ?
-                Promise.resolve({ state: Notification.permission }) :
-                originalQuery(parameters)
-        );
-        window.chrome = {runtime: {}};
-    """)
     
     return driver
 
 
 def human_delay(min_sec=None, max_sec=None):
     """Random delay to mimic human behavior"""
+    if min_sec is None and max_sec is None:
+        time.sleep(MIN_DELAY + _DELAY_SPAN * _rand())
+        return
     if min_sec is None:
         min_sec = MIN_DELAY
     if max_sec is None:
         max_sec = MAX_DELAY
-    delay = random.uniform(min_sec, max_sec)
-    time.sleep(delay)
+    time.sleep(min_sec + (max_sec - min_sec) * _rand())
 
 
 def profile_delay():
     """Longer delay between profiles to avoid detection"""
-    delay = random.uniform(PROFILE_DELAY_MIN, PROFILE_DELAY_MAX)
-    print(f"⏳ Waiting {delay:.1f}s before next profile (anti-detection)...")
+    delay = PROFILE_DELAY_MIN + _PROFILE_DELAY_SPAN * _rand()
+    logger.debug("Waiting %.1fs before next profile (anti-detection)...", delay)
     time.sleep(delay)
 
 
@@ -146,9 +282,9 @@ def random_mouse_movement(driver):
     """Simulate random mouse movements"""
     try:
         actions = ActionChains(driver)
-        for _ in range(random.randint(2, 4)):
-            x_offset = random.randint(-100, 100)
-            y_offset = random.randint(-100, 100)
+        for _ in range(_randint(2, 4)):
+            x_offset = _randint(-100, 100)
+            y_offset = _randint(-100, 100)
             actions.move_by_offset(x_offset, y_offset)
         actions.perform()
     except:
@@ -161,28 +297,41 @@ def smooth_scroll(driver, element):
         "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
         element
     )
-    time.sleep(random.uniform(0.3, 0.6))
+    time.sleep(0.3 + 0.3 * _rand())
+
+
+# Whole scroll sequence runs inside the browser so the pauses don't cost a
+# WebDriver round-trip each. Resolves with the final document height.
+_SCROLL_JS = """
+const done = arguments[arguments.length - 1];
+const rand = (min, max) => min + Math.random() * (max - min);
+const sleep = (ms) => new Promise(r => setTimeout(r, ms));
+(async () => {
+    const pause = rand(800, 1200);
+    const lastHeight = document.body.scrollHeight;
+    for (let i = 0; i < 5; i++) {
+        window.scrollBy(0, Math.floor(rand(1000, 1500)));
+        await sleep(rand(500, 800));
+        if (Math.random() > 0.85) {
+            window.scrollBy(0, -Math.floor(rand(100, 300)));
+            await sleep(rand(300, 500));
+        }
+    }
+    window.scrollTo(0, document.body.scrollHeight);
+    await sleep(pause);
+    const newHeight = document.body.scrollHeight;
+    if (newHeight > lastHeight) {
+        window.scrollTo(0, document.body.scrollHeight);
+        await sleep(pause);
+    }
+    window.scrollTo(0, 0);
+    await sleep(rand(500, 800));
+    done(document.body.scrollHeight);
+})();
+"""
 
 
 def scroll_page_to_load(driver):
     """Scroll entire page to load all lazy-loaded content"""
-    print("Scrolling page to load all content...")
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    scroll_pause_time = random.uniform(0.8, 1.2)
-    
-    for i in range(5):
-        scroll_amount = random.randint(1000, 1500)
-        driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
-        time.sleep(random.uniform(0.5, 0.8))
-        if random.random() > 0.85:
-            driver.execute_script(f"window.scrollBy(0, -{random.randint(100, 300)});")
-            time.sleep(random.uniform(0.3, 0.5))
-    
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(scroll_pause_time)
-    new_height = driver.execute_script("return document.body.scrollHeight")
-    if new_height > last_height:
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(scroll_pause_time)
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(random.uniform(0.5, 0.8))
+    logger.debug("Scrolling page to load all content...")
+    return driver.execute_async_script(_SCROLL_JS)
@@ -1,10 +1,14 @@
 """Helper functions for extracting data from LinkedIn pages"""
 import time
 import random
+import logging
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from .browser_helper import human_delay, smooth_scroll
 
+logger = logging.getLogger(__name__)
+
 
 def click_show_all(driver, section):
     """Click 'Show all' link in section"""
@@ -12,89 +16,95 @@ def click_show_all(driver, section):
         smooth_scroll(driver, section)
         human_delay(0.5, 0.8)
         
+        # Text matches need XPath; class-based lookups use native CSS ([class*=] keeps contains() semantics)
         selectors = [
-            ".//a[contains(text(), 'Show all')]",
-            ".//a[contains(., 'Show all')]",
-            ".//div[contains(@class, 'pvs-list__footer')]//a",
+            (By.XPATH, ".//a[contains(text(), 'Show all')]"),
+            (By.XPATH, ".//a[contains(., 'Show all')]"),
+            (By.CSS_SELECTOR, "div[class*='pvs-list__footer'] a"),
         ]
         
-        for selector in selectors:
-            try:
-                button = section.find_element(By.XPATH, selector)
+        for by, selector in selectors:
+            buttons = section.find_elements(by, selector)
+            if buttons:
+                button = buttons[0]
                 button_text = button.text.strip()
-                print(f"  Found: '{button_text}'")
+                logger.debug("Found: '%s'", button_text)
                 driver.execute_script("arguments[0].click();", button)
-                print("  ✓ Clicked 'Show all'")
+                logger.debug("Clicked 'Show all'")
                 human_delay(2, 2.5)
                 return True
-            except NoSuchElementException:
-                continue
         
-        print("  ⚠ No 'Show all' button found")
+        logger.debug("No 'Show all' button found")
         return False
     except Exception as e:
-        print(f"  Error clicking show all: {e}")
+        logger.warning("Error clicking show all: %s", e)
         return False
 
 
 def click_back_arrow(driver):
     """Click back arrow to return to main profile"""
     try:
-        print("  Clicking back arrow...")
+        logger.debug("Clicking back arrow...")
         
         selectors = [
-            "//button[@aria-label='Back']",
-            "//button[contains(@class, 'artdeco-button') and contains(@aria-label, 'Back')]",
-            "//button[contains(@class, 'scaffold-layout__back-button')]",
+            "button[aria-label='Back']",
+            "button[class*='artdeco-button'][aria-label*='Back']",
+            "button[class*='scaffold-layout__back-button']",
         ]
         
         for selector in selectors:
-            try:
-                back_button = driver.find_element(By.XPATH, selector)
-                driver.execute_script("arguments[0].click();", back_button)
-                print("  ✓ Clicked back arrow")
+            back_buttons = driver.find_elements(By.CSS_SELECTOR, selector)
+            if back_buttons:
+                driver.execute_script("arguments[0].click();", back_buttons[0])
+                logger.debug("Clicked back arrow")
                 human_delay(1.5, 2)
                 return True
-            except NoSuchElementException:
-                continue
         
-        print("  ⚠ Back button not found, using browser back")
+        logger.debug("Back button not found, using browser back")
         driver.back()
         human_delay(1.5, 2)
         return True
         
     except Exception as e:
-        print(f"  Error clicking back: {e}")
+        logger.warning("Error clicking back: %s", e)
         return False
 
 
+# [class*=...] matches substrings like the old XPath contains(@class, ...),
+# so variants such as pvs-list__outer-container still count
+DETAIL_ITEM_SELECTORS = [
+    "main ul[class*='pvs-list'] > li[class*='pvs-list__paged-list-item']",
+    "main ul[class*='pvs-list'] > li",
+    "div[class*='scaffold-finite-scroll__content'] ul > li",
+    "main ul > li[class*='artdeco-list__item']",
+]
+
+# Union of all detail item selectors, used to wait until any of them matches
+_DETAIL_ITEMS_CSS = ", ".join(DETAIL_ITEM_SELECTORS)
+
+
 def extract_items_from_detail_page(driver):
     """Extract items from detail page after clicking 'Show all'"""
     items = []
     
-    print("  Waiting for detail page to load...")
-    human_delay(2, 2.5)
+    logger.debug("Waiting for detail page to load...")
+    try:
+        WebDriverWait(driver, 5, poll_frequency=0.2).until(
+            lambda d: d.find_elements(By.CSS_SELECTOR, _DETAIL_ITEMS_CSS)
+        )
+    except TimeoutException:
+        logger.debug("Detail page items did not appear within 5s")
     
     driver.execute_script("window.scrollTo(0, 0);")
-    human_delay(1, 1.5)
-    
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
-    human_delay(0.8, 1)
-    
-    selectors = [
-        "//main//ul[contains(@class, 'pvs-list')]/li[contains(@class, 'pvs-list__paged-list-item')]",
-        "//main//ul[contains(@class, 'pvs-list')]/li",
-        "//div[contains(@class, 'scaffold-finite-scroll__content')]//ul/li",
-        "//main//ul/li[contains(@class, 'artdeco-list__item')]",
-    ]
     
-    for selector in selectors:
-        items = driver.find_elements(By.XPATH, selector)
+    for selector in DETAIL_ITEM_SELECTORS:
+        items = driver.find_elements(By.CSS_SELECTOR, selector)
         if items and len(items) > 0:
-            print(f"  ✓ Found {len(items)} items using selector")
+            logger.debug("Found %d items using selector", len(items))
             break
     
     if not items:
-        print("  ⚠ No items found on detail page!")
+        logger.warning("No items found on detail page!")
     
     return items
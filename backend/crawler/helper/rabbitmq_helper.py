@@ -58,9 +58,7 @@ class RabbitMQManager:
             print(f"✓ Connected to RabbitMQ at {self.host}:{self.port} (SSL: {use_ssl})")
             return True
         except Exception as e:
-            print(f"✗ Failed to connect to RabbitMQ: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"✗ Failed to connect to RabbitMQ at {self.host}:{self.port} ({type(e).__name__}): {e}")
             return False
     
     def publish_url(self, url):
@@ -1,11 +1,29 @@
 """Supabase helper for storing crawled data"""
 import os
+import threading
 from datetime import datetime
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# One Supabase client per process: its PostgREST session keeps HTTP connections
+# alive, so every SupabaseManager() shares warm sockets instead of re-handshaking
+_shared_clients = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_client(url, key) -> Client:
+    """Get (or lazily create) the process-wide Supabase client for url/key"""
+    client = _shared_clients.get((url, key))
+    if client is None:
+        with _shared_clients_lock:
+            client = _shared_clients.get((url, key))
+            if client is None:
+                client = create_client(url, key)
+                _shared_clients[(url, key)] = client
+    return client
+
 
 class SupabaseManager:
     def __init__(self):
@@ -16,7 +34,7 @@ class SupabaseManager:
         if not self.url or not self.key:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in .env")
         
-        self.client: Client = create_client(self.url, self.key)
+        self.client: Client = get_shared_client(self.url, self.key)
         # Remove the print statement to avoid spam
         # print(f"✓ Supabase client initialized")
     
@@ -24,6 +42,11 @@ class SupabaseManager:
         """
         Save crawled profile to leads_list table
         
+        Upsert on profile_url (requires the unique index from
+        supabase_migration.sql); new rows get `date` from the column default.
+        template_id is only set on insert, so a lead queued again by another
+        template stays with the first one.
+        
         Args:
             profile_url: LinkedIn profile URL
             name: Person's name
@@ -35,45 +58,33 @@ class SupabaseManager:
             bool: Success status
         """
         try:
-            # Check if lead already exists
-            existing = self.client.table('leads_list')\
-                .select('id')\
-                .eq('profile_url', profile_url)\
+            lead_data = {
+                'profile_url': profile_url,
+                'name': name,
+                'profile_data': profile_data,
+                'connection_status': connection_status
+            }
+            
+            if not template_id:
+                self.client.table('leads_list')\
+                    .upsert(lead_data, on_conflict='profile_url')\
+                    .execute()
+                print(f"  ✓ Saved lead: {name}")
+                return True
+            
+            # Insert-if-absent with the template; an existing lead comes back empty
+            inserted = self.client.table('leads_list')\
+                .upsert({**lead_data, 'template_id': template_id}, on_conflict='profile_url', ignore_duplicates=True)\
                 .execute()
             
-            if existing.data:
-                # Update existing lead
-                update_data = {
-                    'name': name,
-                    'profile_data': profile_data,
-                    'connection_status': connection_status
-                }
-                
-                result = self.client.table('leads_list')\
-                    .update(update_data)\
+            if inserted.data:
+                print(f"  ✓ Saved new lead: {name}")
+            else:
+                self.client.table('leads_list')\
+                    .update(lead_data)\
                     .eq('profile_url', profile_url)\
                     .execute()
-                
                 print(f"  ✓ Updated existing lead: {name}")
-            else:
-                # Insert new lead
-                insert_data = {
-                    'profile_url': profile_url,
-                    'name': name,
-                    'profile_data': profile_data,
-                    'connection_status': connection_status,
-                    'date': datetime.now().date().isoformat()
-                }
-                
-                if template_id:
-                    insert_data['template_id'] = template_id
-                
-                result = self.client.table('leads_list')\
-                    .insert(insert_data)\
-                    .execute()
-                
-                print(f"  ✓ Saved new lead: {name}")
-            
             return True
             
         except Exception as e:
@@ -178,6 +189,8 @@ class SupabaseManager:
         """
         Update lead after scraping (insert or update)
         
+        Single upsert on profile_url instead of select + insert/update.
+        
         Args:
             profile_url: LinkedIn profile URL
             profile_data: Complete scraped profile data
@@ -186,67 +199,27 @@ class SupabaseManager:
             bool: Success status
         """
         try:
-            print(f"  → Checking if lead exists: {profile_url}")
-            
-            # Check if lead exists
-            existing = self.client.table('leads_list')\
-                .select('id, name, connection_status')\
-                .eq('profile_url', profile_url)\
-                .execute()
+            name = profile_data.get('name', 'Unknown')
+            print(f"  → Upserting lead: {name} ({profile_url})")
             
-            print(f"  → Existing lead query result: {existing.data}")
+            lead_data = {
+                'profile_url': profile_url,
+                'name': name,
+                'profile_data': profile_data,
+                'connection_status': 'scraped',
+                'processed_at': datetime.now().isoformat()
+            }
             
-            name = profile_data.get('name', 'Unknown')
+            result = self.client.table('leads_list')\
+                .upsert(lead_data, on_conflict='profile_url')\
+                .execute()
             
-            if existing.data and len(existing.data) > 0:
-                # Update existing lead
-                print(f"  → Updating existing lead: {existing.data[0]}")
-                
-                update_data = {
-                    'name': name,
-                    'profile_data': profile_data,
-                    'connection_status': 'scraped',
-                    'processed_at': datetime.now().isoformat()
-                }
-                
-                result = self.client.table('leads_list')\
-                    .update(update_data)\
-                    .eq('profile_url', profile_url)\
-                    .execute()
-                
-                print(f"  → Update result: {result.data}")
-                
-                if result.data:
-                    print(f"  ✓ Updated existing lead: {name}")
-                    return True
-                else:
-                    print(f"  ⚠️  Update returned empty data")
-                    return False
+            if result.data:
+                print(f"  ✓ Saved lead: {name}")
+                return True
             else:
-                # Insert new lead
-                print(f"  → Inserting new lead: {name}")
-                
-                insert_data = {
-                    'profile_url': profile_url,
-                    'name': name,
-                    'profile_data': profile_data,
-                    'connection_status': 'scraped',
-                    'date': datetime.now().date().isoformat(),
-                    'processed_at': datetime.now().isoformat()
-                }
-                
-                result = self.client.table('leads_list')\
-                    .insert(insert_data)\
-                    .execute()
-                
-                print(f"  → Insert result: {result.data}")
-                
-                if result.data:
-                    print(f"  ✓ Inserted new lead: {name}")
-                    return True
-                else:
-                    print(f"  ⚠️  Insert returned empty data")
-                    return False
+                print(f"  ⚠️  Upsert returned empty data")
+                return False
             
         except Exception as e:
             print(f"  ✗ Failed to save to Supabase: {e}")
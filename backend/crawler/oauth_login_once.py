@@ -24,7 +24,7 @@ def main():
             return
     
     print("\n→ Membuka browser...")
-    driver = create_driver()
+    driver = create_driver(load_images=True)
     
     try:
         print("→ Membuka LinkedIn login page...")
@@ -8,8 +8,10 @@ import time
 import json
 import subprocess
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+from helper.supabase_helper import get_shared_client
 import logging
 import psutil
 
@@ -23,23 +25,56 @@ logger = logging.getLogger(__name__)
 # Load environment
 load_dotenv()
 
-# Supabase client
-supabase: Client = create_client(
-    os.getenv('SUPABASE_URL'),
-    os.getenv('SUPABASE_KEY')
-)
+
+def get_supabase() -> Client:
+    """Get the process-wide Supabase client (created on first use, then reused
+    so its HTTP keep-alive connections stay warm across polls)"""
+    return get_shared_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
+
 
 # Config
 POLL_INTERVAL = int(os.getenv('POLL_INTERVAL', 60))  # 1 minute default
+MAX_POLL_INTERVAL = int(os.getenv('MAX_POLL_INTERVAL', 1800))  # 30 minutes cap while idle
 DEFAULT_REQUIREMENTS_ID = os.getenv('DEFAULT_REQUIREMENTS_ID', 'desk_collection')
+SCHEDULE_REFRESH_INTERVAL = int(os.getenv('SCHEDULE_REFRESH_INTERVAL', 300))  # 5 minutes default
+
+# Only the columns the daemon reads - keeps the poll response small
+SCHEDULE_COLUMNS = 'id, name, start_schedule, stop_schedule, last_run'
+
+# Active schedules cached between polls - rows rarely change, so only re-fetch
+# every SCHEDULE_REFRESH_INTERVAL seconds
+_schedule_cache = {'rows': [], 'fetched_at': None}
+
+
+def get_active_schedules(force_refresh=False):
+    """Get active schedules, re-querying Supabase only when the cache is stale"""
+    fetched_at = _schedule_cache['fetched_at']
+    if force_refresh or fetched_at is None or time.monotonic() - fetched_at > SCHEDULE_REFRESH_INTERVAL:
+        response = get_supabase().table('crawler_schedules')\
+            .select(SCHEDULE_COLUMNS)\
+            .eq('status', 'active')\
+            .execute()
+        _schedule_cache['rows'] = response.data or []
+        _schedule_cache['fetched_at'] = time.monotonic()
+        logger.debug(f"Refreshed {len(_schedule_cache['rows'])} active schedules from Supabase")
+    return _schedule_cache['rows']
+
+
+@lru_cache(maxsize=1024)
+def _parse_timestamp(value):
+    """Parse an ISO timestamp from Supabase as an aware UTC datetime (cached per raw string)"""
+    # Python 3.11+ fromisoformat accepts the trailing 'Z' directly
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        # Naive values were written as UTC - comparing them to now(UTC) would raise
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
 
 
 def get_pending_schedules():
     """Get schedules that should run now based on cron expressions"""
     try:
-        # Get active schedules
-        response = supabase.table('crawler_schedules').select('*').eq('status', 'active').execute()
-        schedules = response.data
+        schedules = get_active_schedules()
         
         pending = []
         now = datetime.now(timezone.utc)  # Use UTC timezone
@@ -64,7 +99,7 @@ def get_pending_schedules():
             if should_run:
                 # Additional check: don't run too frequently (at least 5 minutes apart)
                 if last_run:
-                    last_run_time = datetime.fromisoformat(last_run.replace('Z', '+00:00'))
+                    last_run_time = _parse_timestamp(last_run)
                     time_diff = (now - last_run_time).total_seconds()
                     
                     # Skip if last run was less than 5 minutes ago
@@ -165,25 +200,87 @@ def _should_run_now(start_cron, stop_cron, hour, minute, day):
         return False
 
 
+def _seconds_until_next_start(schedules, now):
+    """Seconds until the earliest start_schedule time of day among schedules (None if unknown)"""
+    current_minutes = now.hour * 60 + now.minute
+    waits = []
+    
+    for schedule in schedules:
+        parts = (schedule.get('start_schedule') or '').split()
+        if len(parts) < 5:
+            continue
+        try:
+            start_m = 0 if parts[0] == '*' else int(parts[0])
+            start_h = 0 if parts[1] == '*' else int(parts[1])
+        except ValueError:
+            continue
+        waits.append(((start_h * 60 + start_m - current_minutes) % 1440) * 60 - now.second)
+    
+    return max(0, min(waits)) if waits else None
+
+
+def get_idle_sleep(idle_rounds):
+    """Sleep interval after idle_rounds consecutive polls without pending schedules
+    
+    Doubles POLL_INTERVAL per idle round up to MAX_POLL_INTERVAL, but never
+    sleeps past the next schedule start and stays at POLL_INTERVAL while any
+    schedule is inside its run window (those re-run every 5 minutes).
+    """
+    schedules = get_active_schedules()
+    now = datetime.now(timezone.utc)
+    
+    if any(_should_run_now(s.get('start_schedule', ''), s.get('stop_schedule', ''),
+                           now.hour, now.minute, now.weekday()) for s in schedules):
+        return POLL_INTERVAL
+    
+    sleep_for = min(POLL_INTERVAL * (2 ** idle_rounds), MAX_POLL_INTERVAL)
+    
+    until_next = _seconds_until_next_start(schedules, now)
+    if until_next is not None:
+        sleep_for = min(sleep_for, until_next)
+    
+    return max(POLL_INTERVAL, sleep_for)
+
+
+def iter_unscraped_profiles(chunk_size=1000):
+    """Yield lists of unscraped profile URLs, chunk_size at a time
+    
+    Keyset-paginates on id (id > last seen) rather than using offsets, so
+    leads scraped while iterating don't shift later pages and get skipped.
+    Criteria: profile_data is null or empty
+    """
+    last_id = None
+    
+    while True:
+        # Get leads where profile_data is null or empty - both filtered server-side
+        query = get_supabase().table('leads_list')\
+            .select('id, profile_url')\
+            .or_('profile_data.is.null,profile_data.eq.{}')
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        
+        rows = query.order('id').limit(chunk_size).execute().data or []
+        if not rows:
+            return
+        
+        last_id = rows[-1]['id']
+        yield [url for lead in rows if (url := lead.get('profile_url'))]
+        
+        if len(rows) < chunk_size:
+            return
+
+
 def get_unscraped_profiles_from_supabase(limit=100):
     """Get profile URLs from leads_list that haven't been scraped yet
     
     Criteria: profile_data is null or empty
     """
     try:
-        # Get leads where profile_data is null or empty
-        response = supabase.table('leads_list')\
-            .select('profile_url, name')\
-            .is_('profile_data', 'null')\
-            .limit(limit)\
-            .execute()
-        
         urls = []
-        if response.data:
-            for lead in response.data:
-                url = lead.get('profile_url')
-                if url:
-                    urls.append(url)
+        for chunk in iter_unscraped_profiles(chunk_size=min(limit, 1000)):
+            urls.extend(chunk[:limit - len(urls)])
+            if len(urls) >= limit:
+                break
         
         logger.info(f"Found {len(urls)} unscraped profiles in Supabase")
         return urls
@@ -193,8 +290,53 @@ def get_unscraped_profiles_from_supabase(limit=100):
         return []
 
 
-def execute_schedule(schedule):
-    """Execute a scheduled crawl job - Start consumer if needed"""
+def mark_schedules_run(schedules):
+    """Set last_run for all given schedules in one UPDATE ... WHERE id IN (...)"""
+    if not schedules:
+        return False
+    
+    try:
+        last_run = datetime.now(timezone.utc).isoformat()
+        get_supabase().table('crawler_schedules').update({
+            'last_run': last_run
+        }).in_('id', [schedule['id'] for schedule in schedules]).execute()
+    except Exception as e:
+        logger.error(f"Error updating last_run: {e}")
+        return False
+    
+    # Keep the cached rows in sync so the next poll sees the new last_run
+    for schedule in schedules:
+        schedule['last_run'] = last_run
+    logger.info(f"✓ Updated last_run timestamp for {len(schedules)} schedule(s)")
+    return True
+
+
+def get_queue_status():
+    """Get (queue_name, messages waiting) for the crawler queue - (None, None) if unreachable"""
+    from helper.rabbitmq_helper import RabbitMQManager
+    
+    # Use RabbitMQ helper instead of direct pika
+    mq = RabbitMQManager()
+    
+    if not mq.connect():
+        logger.error(f"✗ Failed to connect to RabbitMQ")
+        return None, None
+    
+    queue_size = mq.get_queue_size()
+    mq.close()
+    return mq.queue_name, queue_size
+
+
+def execute_schedule(schedule, update_last_run=True, queue_status=None):
+    """Execute a scheduled crawl job - Start consumer if needed
+    
+    Args:
+        schedule: Schedule row from crawler_schedules
+        update_last_run: Set last_run here (False when the caller already
+            batch-updated it with mark_schedules_run)
+        queue_status: (queue_name, queue_size) already fetched this tick;
+            checked here when not given
+    """
     schedule_id = schedule['id']
     schedule_name = schedule['name']
     
@@ -203,28 +345,16 @@ def execute_schedule(schedule):
     logger.info(f"Schedule ID: {schedule_id}")
     logger.info(f"{'='*60}\n")
     
-    # Update last_run
-    try:
-        supabase.table('crawler_schedules').update({
-            'last_run': datetime.now(timezone.utc).isoformat()
-        }).eq('id', schedule_id).execute()
-        logger.info(f"✓ Updated last_run timestamp")
-    except Exception as e:
-        logger.error(f"Error updating last_run: {e}")
+    if update_last_run:
+        mark_schedules_run([schedule])
     
     # Check queue status
     try:
-        from helper.rabbitmq_helper import RabbitMQManager
-        
-        # Use RabbitMQ helper instead of direct pika
-        mq = RabbitMQManager()
+        queue_name, queue_size = queue_status or get_queue_status()
         
-        if mq.connect():
-            queue_size = mq.get_queue_size()
-            mq.close()
-            
+        if queue_size is not None:
             logger.info(f"📊 Queue Status:")
-            logger.info(f"   - Queue: {mq.queue_name}")
+            logger.info(f"   - Queue: {queue_name}")
             logger.info(f"   - Messages waiting: {queue_size}")
             
             if queue_size > 0:
@@ -238,8 +368,6 @@ def execute_schedule(schedule):
                     logger.info(f"✅ Crawler consumer is already running")
             else:
                 logger.info(f"ℹ️  Queue is empty - no profiles to process")
-        else:
-            logger.error(f"✗ Failed to connect to RabbitMQ")
         
     except Exception as e:
         logger.error(f"✗ Failed to check queue: {e}")
@@ -305,6 +433,8 @@ def main():
     logger.info(f"Supabase URL: {os.getenv('SUPABASE_URL')}")
     logger.info("="*60)
     
+    idle_rounds = 0
+    
     while True:
         try:
             logger.info(f"\n[{datetime.now(timezone.utc)}] Checking for pending schedules...")
@@ -314,11 +444,24 @@ def main():
             if pending_schedules:
                 logger.info(f"Found {len(pending_schedules)} pending schedule(s)")
                 
+                # One round-trip for every schedule firing this tick
+                last_run_updated = mark_schedules_run(pending_schedules)
+                
+                # All schedules feed the same crawler queue - check it once per tick
+                try:
+                    queue_status = get_queue_status()
+                except Exception as e:
+                    logger.error(f"✗ Failed to check queue: {e}")
+                    queue_status = None
+                
                 for schedule in pending_schedules:
                     logger.info(f"Executing schedule: {schedule['name']}")
                     logger.info(f"  Start: {schedule.get('start_schedule', 'N/A')}")
                     logger.info(f"  Stop: {schedule.get('stop_schedule', 'N/A')}")
-                    execute_schedule(schedule)
+                    execute_schedule(schedule, update_last_run=not last_run_updated, queue_status=queue_status)
+                
+                idle_rounds = 0
+                sleep_for = POLL_INTERVAL
             else:
                 # Show current time and why no schedules are running
                 now = datetime.now(timezone.utc)
@@ -326,18 +469,21 @@ def main():
                 
                 # Show all active schedules for debugging
                 try:
-                    response = supabase.table('crawler_schedules').select('name, start_schedule, stop_schedule, status').eq('status', 'active').execute()
-                    if response.data:
+                    active_schedules = get_active_schedules()
+                    if active_schedules:
                         logger.info("Active schedules:")
-                        for schedule in response.data:
+                        for schedule in active_schedules:
                             logger.info(f"  - {schedule['name']}: {schedule.get('start_schedule', 'N/A')} to {schedule.get('stop_schedule', 'N/A')}")
                     else:
                         logger.info("No active schedules found in database")
                 except Exception as e:
                     logger.error(f"Error fetching schedules for debug: {e}")
+                
+                sleep_for = get_idle_sleep(idle_rounds)
+                idle_rounds += 1
             
-            logger.info(f"Sleeping for {POLL_INTERVAL} seconds...\n")
-            time.sleep(POLL_INTERVAL)
+            logger.info(f"Sleeping for {sleep_for} seconds...\n")
+            time.sleep(sleep_for)
         
         except KeyboardInterrupt:
             logger.info("\n\nShutting down gracefully...")
@@ -0,0 +1,45 @@
+"""
+Duplicate-file checks for saved crawler output
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    import crawler_consumer
+except ImportError as e:
+    pytest.skip(f"crawler dependencies not installed: {e}", allow_module_level=True)
+
+
+def _write_profile(path, profile_url):
+    path.write_text(json.dumps({'profile_url': profile_url}), encoding='utf-8')
+
+
+def test_hash_named_file_is_found(tmp_path):
+    """A file named *_{url_hash}.json counts as already crawled"""
+    url = 'https://www.linkedin.com/in/hash-hit'
+    expected = tmp_path / f"jane_doe_20250101_000000_{crawler_consumer.get_profile_hash(url)}.json"
+    _write_profile(expected, url)
+
+    assert crawler_consumer.check_if_already_crawled(url, str(tmp_path)) == (True, str(expected))
+
+
+def test_index_fallback_finds_differently_named_file(tmp_path):
+    """A file whose name lacks the hash is still found through its profile_url"""
+    url = 'https://www.linkedin.com/in/index-hit'
+    expected = tmp_path / "legacy_export.json"
+    _write_profile(expected, url)
+
+    assert crawler_consumer.check_if_already_crawled(url, str(tmp_path)) == (True, str(expected))
+
+
+def test_unknown_profile_is_a_miss(tmp_path):
+    """Neither a matching name nor a matching profile_url means not crawled"""
+    _write_profile(tmp_path / "someone_else.json", 'https://www.linkedin.com/in/other')
+
+    url = 'https://www.linkedin.com/in/miss'
+    assert crawler_consumer.check_if_already_crawled(url, str(tmp_path)) == (False, None)
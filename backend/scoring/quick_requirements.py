@@ -1,15 +1,18 @@
 """
 Quick Requirements Generator - Simplified version
-Usage: python quick_requirements.py "job_description.txt"
+Usage: python quick_requirements.py  (interactive)
+       python quick_requirements.py --template desk_collection --position "Desk Collection" [--min-exp 2 ...]
 """
+import argparse
 import json
+import string
 import sys
-import re
 from pathlib import Path
+from types import MappingProxyType
 
 
 # Template requirements untuk berbagai posisii
-TEMPLATES = {
+_TEMPLATE_DATA = {
     "desk_collection": {
         "required_experience_keywords": [
             "Desk Collection", "Call Collection", "Telecollection",
@@ -80,6 +83,29 @@ TEMPLATES = {
     }
 }
 
+# Serialized once - quick_generate hands out fresh copies via json.loads
+_TEMPLATE_JSON = {name: json.dumps(template) for name, template in _TEMPLATE_DATA.items()}
+
+# Read-only view (keyword lists as tuples) so callers can't corrupt a template
+TEMPLATES = MappingProxyType({
+    name: MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else MappingProxyType(value)
+        for key, value in template.items()
+    })
+    for name, template in _TEMPLATE_DATA.items()
+})
+
+
+class _SlugTable(dict):
+    """str.translate table that drops every character it doesn't map"""
+    def __missing__(self, codepoint):
+        return None
+
+
+# Filename slug: keep a-z, 0-9 and _, turn spaces and slashes into _
+_SLUG_TABLE = _SlugTable({ord(c): c for c in string.ascii_lowercase + string.digits + '_'})
+_SLUG_TABLE.update({ord(' '): '_', ord('/'): '_'})
+
 
 def quick_generate(template_name, position, min_exp=1, gender=None, location=None, age_range=None):
     """Quick generate requirements from template"""
@@ -89,7 +115,8 @@ def quick_generate(template_name, position, min_exp=1, gender=None, location=Non
         print(f"Available templates: {', '.join(TEMPLATES.keys())}")
         return None
     
-    template = TEMPLATES[template_name]
+    # Fresh copy - mutating the result never touches the template
+    template = json.loads(_TEMPLATE_JSON[template_name])
     
     requirements = {
         "position": position,
@@ -114,11 +141,37 @@ def quick_generate(template_name, position, min_exp=1, gender=None, location=Non
     return requirements
 
 
-def main():
-    print("="*70)
-    print("QUICK REQUIREMENTS GENERATOR")
-    print("="*70)
-    
+def parse_age_range(text):
+    """Parse "20-35" into {"min": 20, "max": 35} (None if empty/'none'/invalid)"""
+    if not text or text.lower() == 'none' or '-' not in text:
+        return None
+    try:
+        min_age, max_age = text.split('-')
+        return {"min": int(min_age.strip()), "max": int(max_age.strip())}
+    except:
+        return None
+
+
+def _optional(value):
+    """Treat empty input and 'none' as not set"""
+    return value if value and value.lower() != 'none' else None
+
+
+def parse_args(argv):
+    """Parse command line flags (for scripted/batch runs)"""
+    parser = argparse.ArgumentParser(description="Quick requirements generator")
+    parser.add_argument('--template', required=True, choices=list(TEMPLATES.keys()))
+    parser.add_argument('--position', required=True, help="Position title")
+    parser.add_argument('--min-exp', type=int, default=1, help="Minimum experience years (default: 1)")
+    parser.add_argument('--gender', help="Male/Female")
+    parser.add_argument('--location', help="Required location")
+    parser.add_argument('--age', help="Age range, e.g. 20-35")
+    parser.add_argument('--output', help="Output filename in requirements/ (default: <position slug>.json)")
+    return parser.parse_args(argv)
+
+
+def prompt_inputs():
+    """Ask for generator inputs interactively (returns None on invalid input)"""
     print("\nAvailable templates:")
     for i, template_name in enumerate(TEMPLATES.keys(), 1):
         print(f"  {i}. {template_name}")
@@ -130,48 +183,60 @@ def main():
         template_name = list(TEMPLATES.keys())[template_idx]
     except (ValueError, IndexError):
         print("Invalid choice!")
-        return
+        return None
     
     # Input details
     position = input("\nPosition Title: ").strip()
     if not position:
         print("Error: Position title is required!")
-        return
+        return None
     
     min_exp = input("Minimum Experience Years (default: 1): ").strip()
     min_exp = int(min_exp) if min_exp else 1
     
-    gender = input("Required Gender (Male/Female/None): ").strip()
-    gender = gender if gender and gender.lower() != 'none' else None
+    gender = _optional(input("Required Gender (Male/Female/None): ").strip())
+    location = _optional(input("Required Location (or None): ").strip())
+    age_range = parse_age_range(input("Age Range (format: 20-35, or None): ").strip())
+    
+    return template_name, position, min_exp, gender, location, age_range
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
     
-    location = input("Required Location (or None): ").strip()
-    location = location if location and location.lower() != 'none' else None
+    print("="*70)
+    print("QUICK REQUIREMENTS GENERATOR")
+    print("="*70)
     
-    age_input = input("Age Range (format: 20-35, or None): ").strip()
-    age_range = None
-    if age_input and age_input.lower() != 'none' and '-' in age_input:
-        try:
-            min_age, max_age = age_input.split('-')
-            age_range = {"min": int(min_age.strip()), "max": int(max_age.strip())}
-        except:
-            pass
+    if argv:
+        # Scripted run - no prompts
+        args = parse_args(argv)
+        inputs = (
+            args.template, args.position, args.min_exp,
+            _optional(args.gender), _optional(args.location), parse_age_range(args.age)
+        )
+    else:
+        inputs = prompt_inputs()
+        if not inputs:
+            return
     
     # Generate
-    requirements = quick_generate(
-        template_name, position, min_exp, gender, location, age_range
-    )
+    requirements = quick_generate(*inputs)
     
     if not requirements:
         return
     
     # Save
-    filename_slug = position.lower().replace(' ', '_').replace('/', '_')
-    filename_slug = re.sub(r'[^a-z0-9_]', '', filename_slug)
+    position = inputs[1]
+    filename_slug = position.lower().translate(_SLUG_TABLE)
     default_filename = f"{filename_slug}.json"
     
-    filename = input(f"\nSave as (default: {default_filename}): ").strip()
-    if not filename:
-        filename = default_filename
+    if argv:
+        filename = args.output or default_filename
+    else:
+        filename = input(f"\nSave as (default: {default_filename}): ").strip()
+        if not filename:
+            filename = default_filename
     
     if not filename.endswith('.json'):
         filename += '.json'
@@ -179,12 +244,13 @@ def main():
     filepath = Path('requirements') / filename
     filepath.parent.mkdir(exist_ok=True)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(requirements, f, indent=2, ensure_ascii=False)
+    # Serialize once - the same text is saved and previewed
+    requirements_json = json.dumps(requirements, indent=2, ensure_ascii=False)
+    filepath.write_text(requirements_json, encoding='utf-8')
     
     print(f"\n✓ Requirements saved to: {filepath}")
     print("\nPreview:")
-    print(json.dumps(requirements, indent=2, ensure_ascii=False))
+    print(requirements_json)
 
 
 if __name__ == "__main__":
@@ -2,18 +2,21 @@
 Scoring Consumer - Process profiles from RabbitMQ and calculate scores
 OPTIMIZED VERSION
 """
+import gzip
 import json
 import os
 import sys
 import threading
 import time
 import re
-import glob
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import count, islice
 from pathlib import Path
 import pika
 from dotenv import load_dotenv
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 from supabase import create_client, Client
 
 # Add API helper to path for shared utilities (with fallback)
@@ -29,10 +32,12 @@ except ImportError:
     # Local fallback implementations
     import hashlib
     import threading
+    from functools import lru_cache
     
+    @lru_cache(maxsize=10000)
     def get_profile_hash(profile_url):
-        """Generate unique hash from profile URL"""
-        return hashlib.md5(profile_url.encode()).hexdigest()[:8]
+        """Generate unique hash from profile URL (4-byte BLAKE2b, 8 hex chars)"""
+        return hashlib.blake2b(profile_url.encode(), digest_size=4).hexdigest()
     
     class StatsManager:
         def __init__(self, stats_config=None):
@@ -114,6 +119,48 @@ except ImportError:
                 print(f"⚠ Webhook check failed: {webhook_error}")
                 return False
 
+# Faster JSON parsing for queue messages and score files (stdlib fallback)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str, with orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Score files are compact by default; SCORE_PRETTY=true indents them for reading
+SCORE_PRETTY = os.getenv('SCORE_PRETTY', 'false').lower() == 'true'
+
+
+def json_dumps_bytes(data):
+    """Serialize to UTF-8 JSON bytes, with orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if SCORE_PRETTY else 0))
+    return json.dumps(data, indent=2 if SCORE_PRETTY else None, ensure_ascii=False).encode('utf-8')
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+def decode_message(body, properties):
+    """Decode a scoring message body by its content encoding and type (JSON or MessagePack)"""
+    if getattr(properties, 'content_encoding', None) == 'gzip':
+        body = gzip.decompress(body)
+    if getattr(properties, 'content_type', None) == 'application/msgpack':
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Received a MessagePack message but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    return json_loads(body)
+
 # Load environment variables
 load_dotenv()
 
@@ -125,6 +172,14 @@ RABBITMQ_PASSWORD = os.getenv('RABBITMQ_PASS', 'guest')
 RABBITMQ_VHOST = os.getenv('RABBITMQ_VHOST', '/')
 SCORING_QUEUE = os.getenv('SCORING_QUEUE', 'scoring_queue')
 
+# Unacked messages each worker may hold; acks go out as one multi-ack per
+# half-prefetch batch (or after ACK_FLUSH_SECONDS) instead of one per message
+RABBITMQ_PREFETCH = max(1, int(os.getenv('RABBITMQ_PREFETCH', '50')))
+ACK_BATCH_SIZE = max(1, RABBITMQ_PREFETCH // 2)
+ACK_FLUSH_SECONDS = 1.0
+# Failed batch upserts retried this many times before falling back to per-message writes
+MAX_FLUSH_RETRIES = 3
+
 # Supabase Configuration
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
@@ -132,6 +187,15 @@ SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 OUTPUT_DIR = 'data/scores'
 REQUIREMENTS_DIR = 'requirements'
 
+# Processes for the CPU-bound checklist scoring (0 = score in the worker thread)
+SCORING_PROCESSES = int(os.getenv('SCORING_PROCESSES', '0'))
+
+# Console output per message: full checklist or just the one-line result,
+# and statistics every N messages (stdout writes serialize the worker threads)
+SCORING_VERBOSE = os.getenv('SCORING_VERBOSE', 'true').lower() == 'true'
+STATS_PRINT_EVERY = max(1, int(os.getenv('STATS_PRINT_EVERY', '1')))
+_messages_handled = count(1)
+
 # Initialize Supabase client (only if credentials provided)
 supabase: Client = None
 if SUPABASE_URL and SUPABASE_KEY:
@@ -150,17 +214,240 @@ stats_manager = StatsManager({
 })
 
 
+# Education keyword -> level, highest first
+EDUCATION_LEVELS = tuple(sorted({
+    'high school': 1, 'sma': 1, 'smk': 1,
+    'diploma': 2, 'associate': 2, 'd3': 2,
+    'bachelor': 3, 's1': 3, 'sarjana': 3,
+    'master': 4, 's2': 4, 'mba': 4,
+    'doctoral': 5, 'phd': 5, 's3': 5
+}.items(), key=lambda item: -item[1]))
+_EDUCATION_LEVEL_BY_NAME = dict(EDUCATION_LEVELS)
+
+# Every keyword in one pass; the lookahead finds overlapping hits too ('sma' in 'smaster')
+_EDUCATION_RE = re.compile('(?=(' + '|'.join(re.escape(name) for name, _ in EDUCATION_LEVELS) + '))')
+
+
+def education_level(text):
+    """Highest education level named in text (0 if none)"""
+    return max((_EDUCATION_LEVEL_BY_NAME[name] for name in _EDUCATION_RE.findall(text)), default=0)
+
+
+# "2 yrs 3 mos" -> number + unit; the first number of each unit wins
+_DURATION_RE = re.compile(r'(\d+)\s*(yr|mo)')
+
+
+def parse_duration(duration):
+    """(years, months) from a LinkedIn duration string, in one pass"""
+    years = months = None
+    for match in _DURATION_RE.finditer(duration):
+        if match.group(2) == 'yr':
+            if years is None:
+                years = int(match.group(1))
+        elif months is None:
+            months = int(match.group(1))
+        if years is not None and months is not None:
+            break
+    return years or 0, months or 0
+
+
+def total_experience_months(experiences):
+    """Sum of all experience durations, in months"""
+    total_months = 0
+    for exp in experiences:
+        if isinstance(exp, dict):
+            years, months = parse_duration(exp.get('duration', ''))
+            total_months += (years * 12) + months
+    return total_months
+
+
+def profile_age(profile):
+    """Profile age, falling back to the crawler's estimated age (None if unknown)"""
+    age = profile.get('age')
+    if not age and profile.get('estimated_age'):
+        estimated = profile['estimated_age']
+        age = estimated.get('estimated_age') if isinstance(estimated, dict) else estimated
+    return age
+
+
+def gender_to_code(gender_str):
+    """Male = 0, Female = 1, Unknown = -1"""
+    gender_str = gender_str.lower()
+    if 'male' in gender_str and 'female' not in gender_str:
+        return 0  # Male
+    elif 'female' in gender_str:
+        return 1  # Female
+    else:
+        return -1  # Unknown
+
+
+_UNSET = object()
+
+
+class ProfileText:
+    """Lower-cased skill names, experience texts and the numbers (total experience,
+    age, education level) of one profile, built on first use
+    
+    Shared by every requirement so each profile is normalized once; the numeric
+    checks are then plain comparisons against the scorer's precomputed bounds.
+    """
+    __slots__ = ('profile', '_skill_names', '_skill_name_set', '_exp_texts', '_exp_words',
+                 '_long_exp_words', '_total_months', '_age_years', '_education_level')
+    
+    def __init__(self, profile):
+        self.profile = profile
+        self._skill_names = None
+        self._skill_name_set = None
+        self._exp_texts = None
+        self._exp_words = None
+        self._long_exp_words = None
+        self._total_months = None
+        self._age_years = _UNSET
+        self._education_level = None
+    
+    @property
+    def skill_names(self):
+        """Non-empty skill names, lower-cased"""
+        if self._skill_names is None:
+            names = []
+            for skill in self.profile.get('skills', []):
+                skill_name = ''
+                if isinstance(skill, dict):
+                    skill_name = skill.get('name', '').lower()
+                elif isinstance(skill, str):
+                    skill_name = skill.lower()
+                
+                if skill_name and skill_name != 'n/a':
+                    names.append(skill_name)
+            self._skill_names = names
+        return self._skill_names
+    
+    @property
+    def skill_name_set(self):
+        """Skill names as a set, for O(1) exact lookups"""
+        if self._skill_name_set is None:
+            self._skill_name_set = frozenset(self.skill_names)
+        return self._skill_name_set
+    
+    @property
+    def exp_texts(self):
+        """'title company description' of each experience, lower-cased"""
+        if self._exp_texts is None:
+            self._exp_texts = [
+                f"{exp.get('title', '').lower()} {exp.get('company', '').lower()} {exp.get('description', '').lower()}"
+                for exp in self.profile.get('experiences', [])
+                if isinstance(exp, dict)
+            ]
+        return self._exp_texts
+    
+    @property
+    def exp_words(self):
+        """Distinct words of the experience texts (fuzzy candidates - repeats can't change a match)"""
+        if self._exp_words is None:
+            self._exp_words = list(dict.fromkeys(word for text in self.exp_texts for word in text.split()))
+        return self._exp_words
+    
+    @property
+    def long_exp_words(self):
+        """Distinct experience words longer than 3 characters"""
+        if self._long_exp_words is None:
+            self._long_exp_words = [word for word in self.exp_words if len(word) > 3]
+        return self._long_exp_words
+    
+    @property
+    def total_months(self):
+        """Total experience duration in months"""
+        if self._total_months is None:
+            self._total_months = total_experience_months(self.profile.get('experiences', []))
+        return self._total_months
+    
+    @property
+    def age_years(self):
+        """Profile age as an int (None if missing or not a number)"""
+        if self._age_years is _UNSET:
+            age = profile_age(self.profile)
+            try:
+                self._age_years = int(age) if age else None
+            except Exception:
+                self._age_years = None
+        return self._age_years
+    
+    @property
+    def education_level(self):
+        """Highest education level across all degrees - one scan over every degree
+        (keywords never contain a newline, so they can't match across degrees)"""
+        if self._education_level is None:
+            degrees = [edu.get('degree', '').lower() for edu in self.profile.get('education', []) if isinstance(edu, dict)]
+            self._education_level = education_level('\n'.join(degrees))
+        return self._education_level
+
+
 class ChecklistScorer:
     """Checklist-based Scorer - Simple True/False matching for each requirement"""
     def __init__(self, requirements):
         self.requirements = requirements
-        self.results = []
+        
+        # Everything that depends only on the template is resolved once here:
+        # result fields, normalized required values and each requirement's
+        # checker, so score() needs no per-profile type dispatch
+        checkers = {
+            'gender': (self._check_gender, self._candidate_gender),
+            'location': (self._check_location, self._candidate_location),
+            'age': (self._check_age, self._candidate_age),
+            'experience': (self._check_experience, self._candidate_experience),
+            'skill': (self._check_skill, self._candidate_skill),
+            'education': (self._check_education, self._candidate_education)
+        }
+        self.requirements_list = requirements.get('requirements', [])
+        self.checklist = []
+        for req in self.requirements_list:
+            req_type = req.get('type', '')
+            required = self._normalize_requirement(req)
+            checker, candidate = checkers.get(req_type, (self._unknown_requirement, self._candidate_unknown))
+            if required is None and req_type in checkers:
+                checker = self._no_requirement
+            self.checklist.append((
+                req.get('id', ''), req.get('label', ''), req_type,
+                req.get('value'), required, checker, candidate
+            ))
+    
+    def _normalize_requirement(self, req):
+        """Pre-process a requirement's value for its checker (None = no requirement)"""
+        req_type = req.get('type', '')
+        req_value = req.get('value')
+        
+        if not req_value:
+            return None
+        
+        if req_type == 'gender':
+            return gender_to_code(str(req_value).lower().strip())
+        elif req_type in ('location', 'skill'):
+            return str(req_value).lower()
+        elif req_type == 'age':
+            # (min, max) bounds, or () if the range can't be parsed
+            if isinstance(req_value, dict):
+                return (req_value.get('min', 0), req_value.get('max', 100))
+            if isinstance(req_value, str) and '-' in req_value:
+                try:
+                    parts = req_value.split('-')
+                    return (int(parts[0].strip()), int(parts[1].strip()))
+                except (ValueError, IndexError):
+                    return ()
+            return ()
+        elif req_type == 'experience':
+            # Number = minimum years, string = keyword to match
+            if isinstance(req_value, str):
+                return req_value.lower()
+            return req_value
+        elif req_type == 'education':
+            return education_level(str(req_value).lower())
+        return req_value
     
     def score(self, profile):
         """Check each requirement and return matched/not matched"""
         
         # Get requirements array from template
-        requirements_list = self.requirements.get('requirements', [])
+        requirements_list = self.requirements_list
         
         if not requirements_list:
             print("⚠ No requirements array found in template")
@@ -171,20 +458,23 @@ class ChecklistScorer:
                 'results': []
             }
         
+        # Fresh per call so one scorer can score many profiles without sharing results
+        results = []
+        text = ProfileText(profile)
         matched_count = 0
         total_count = len(requirements_list)
         
-        for req in requirements_list:
-            req_id = req.get('id', '')
-            req_label = req.get('label', '')
-            req_type = req.get('type', '')
-            req_value = req.get('value')
-            
+        candidate_values = {}  # requirement type -> candidate value, computed once per profile
+        
+        for req_id, req_label, req_type, req_value, required, checker, candidate in self.checklist:
             # Check if requirement is matched
-            matched = self._check_requirement(req, profile)
+            matched = checker(required, profile, text)
             
             # Get candidate value for display
-            candidate_value = self._get_candidate_value(req, profile)
+            if req_type in candidate_values:
+                candidate_value = candidate_values[req_type]
+            else:
+                candidate_value = candidate_values[req_type] = candidate(profile, text)
             
             result = {
                 'id': req_id,
@@ -195,7 +485,7 @@ class ChecklistScorer:
                 'matched': matched
             }
             
-            self.results.append(result)
+            results.append(result)
             
             if matched:
                 matched_count += 1
@@ -206,110 +496,70 @@ class ChecklistScorer:
             'total_requirements': total_count,
             'matched': matched_count,
             'percentage': round(percentage, 2),
-            'results': self.results
+            'results': results
         }
     
-    def _check_requirement(self, req, profile):
-        """Check if a single requirement is matched"""
-        req_type = req.get('type', '')
-        req_id = req.get('id', '')
-        req_value = req.get('value')
-        
-        if req_type == 'gender':
-            return self._check_gender(req_value, profile)
-        elif req_type == 'location':
-            return self._check_location(req_value, profile)
-        elif req_type == 'age':
-            return self._check_age(req_value, profile)
-        elif req_type == 'experience':
-            return self._check_experience(req_value, profile)
-        elif req_type == 'skill':
-            return self._check_skill(req_value, profile)
-        elif req_type == 'education':
-            return self._check_education(req_value, profile)
-        else:
-            return False
+    @staticmethod
+    def _no_requirement(required, profile, text):
+        """Requirement without a value - always matched"""
+        return True
     
-    def _get_candidate_value(self, req, profile):
-        """Get candidate's value for this requirement"""
-        req_type = req.get('type', '')
-        
-        if req_type == 'gender':
-            return profile.get('gender', 'N/A')
-        elif req_type == 'location':
-            return profile.get('location', 'N/A')
-        elif req_type == 'age':
-            age = profile.get('age')
-            if not age and profile.get('estimated_age'):
-                estimated = profile.get('estimated_age', {})
-                if isinstance(estimated, dict):
-                    age = estimated.get('estimated_age')
-                else:
-                    age = estimated
-            return age or 'N/A'
-        elif req_type == 'experience':
-            # Return total years of experience
-            experiences = profile.get('experiences', [])
-            total_months = 0
-            for exp in experiences:
-                if isinstance(exp, dict):
-                    duration = exp.get('duration', '')
-                    years = 0
-                    months = 0
-                    year_match = re.search(r'(\d+)\s*yr', duration)
-                    if year_match:
-                        years = int(year_match.group(1))
-                    month_match = re.search(r'(\d+)\s*mo', duration)
-                    if month_match:
-                        months = int(month_match.group(1))
-                    total_months += (years * 12) + months
-            total_years = round(total_months / 12, 1) if total_months > 0 else 0
-            return f"{total_years} years"
-        elif req_type == 'skill':
-            # Return if skill exists
-            skills = profile.get('skills', [])
-            skill_names = []
-            for s in skills:
-                if isinstance(s, dict):
-                    name = s.get('name', '')
-                    if name and name != 'N/A':
-                        skill_names.append(name)
-                elif isinstance(s, str) and s and s != 'N/A':
-                    skill_names.append(s)
-            return ', '.join(skill_names[:3]) if skill_names else 'N/A'
-        elif req_type == 'education':
-            education = profile.get('education', [])
-            if education and len(education) > 0:
-                if isinstance(education[0], dict):
-                    return education[0].get('degree', 'N/A')
-            return 'N/A'
-        else:
-            return 'N/A'
+    @staticmethod
+    def _unknown_requirement(required, profile, text):
+        """Requirement type without a checker - never matched"""
+        return False
+    
+    # Candidate values for display - each depends only on the requirement type
+    
+    @staticmethod
+    def _candidate_gender(profile, text):
+        return profile.get('gender', 'N/A')
     
-    def _check_gender(self, required_gender, profile):
+    @staticmethod
+    def _candidate_location(profile, text):
+        return profile.get('location', 'N/A')
+    
+    @staticmethod
+    def _candidate_age(profile, text):
+        return profile_age(profile) or 'N/A'
+    
+    @staticmethod
+    def _candidate_experience(profile, text):
+        """Total years of experience"""
+        total_months = text.total_months
+        total_years = round(total_months / 12, 1) if total_months > 0 else 0
+        return f"{total_years} years"
+    
+    @staticmethod
+    def _candidate_skill(profile, text):
+        """First few skills; names are streamed so long skill lists aren't copied"""
+        skill_names = (
+            s.get('name', '') if isinstance(s, dict) else (s if isinstance(s, str) else '')
+            for s in profile.get('skills', [])
+        )
+        shown = list(islice((name for name in skill_names if name and name != 'N/A'), 3))
+        return ', '.join(shown) if shown else 'N/A'
+    
+    @staticmethod
+    def _candidate_education(profile, text):
+        education = profile.get('education', [])
+        if education and isinstance(education[0], dict):
+            return education[0].get('degree', 'N/A')
+        return 'N/A'
+    
+    @staticmethod
+    def _candidate_unknown(profile, text):
+        return 'N/A'
+    
+    def _check_gender(self, required_code, profile, text):
         """Check if gender matches using numeric comparison for accuracy"""
-        if not required_gender:
-            return True
-        
         profile_gender = profile.get('gender', '').lower().strip()
-        required_gender = str(required_gender).lower().strip()
         
         if not profile_gender:
             return False
         
         # Convert to numeric codes for exact comparison
-        # Male = 0, Female = 1
-        def gender_to_code(gender_str):
-            gender_str = gender_str.lower()
-            if 'male' in gender_str and 'female' not in gender_str:
-                return 0  # Male
-            elif 'female' in gender_str:
-                return 1  # Female
-            else:
-                return -1  # Unknown
-        
         profile_code = gender_to_code(profile_gender)
-        required_code = gender_to_code(required_gender)
         
         # If either is unknown, cannot match
         if profile_code == -1 or required_code == -1:
@@ -318,13 +568,9 @@ class ChecklistScorer:
         # Exact match: 0 == 0 (Male) or 1 == 1 (Female)
         return profile_code == required_code
     
-    def _check_location(self, required_location, profile):
+    def _check_location(self, required_location, profile, text):
         """Check if location matches (fuzzy)"""
-        if not required_location:
-            return True
-        
         profile_location = profile.get('location', '').lower()
-        required_location = str(required_location).lower()
         
         if not profile_location:
             return False
@@ -333,184 +579,169 @@ class ChecklistScorer:
         if required_location in profile_location or profile_location in required_location:
             return True
         
-        # Fuzzy match (80% threshold)
-        ratio = fuzz.partial_ratio(required_location, profile_location)
-        return ratio >= 80
+        # Fuzzy match (80% threshold) - the cutoff lets rapidfuzz stop early on clear misses
+        return fuzz.partial_ratio(required_location, profile_location, score_cutoff=80) >= 80
     
-    def _check_age(self, required_age_range, profile):
+    def _check_age(self, age_bounds, profile, text):
         """Check if age is in range"""
-        if not required_age_range:
-            return True
-        
-        # Get profile age
-        profile_age = profile.get('age')
-        if not profile_age and profile.get('estimated_age'):
-            estimated = profile.get('estimated_age', {})
-            if isinstance(estimated, dict):
-                profile_age = estimated.get('estimated_age')
-            else:
-                profile_age = estimated
+        age = text.age_years
         
-        if not profile_age:
+        # Missing age or unparseable range never matches
+        if age is None or not age_bounds:
             return False
         
         try:
-            age = int(profile_age)
-            
-            # If required_age_range is a dict with min/max
-            if isinstance(required_age_range, dict):
-                min_age = required_age_range.get('min', 0)
-                max_age = required_age_range.get('max', 100)
-                return min_age <= age <= max_age
-            
-            # If required_age_range is a string like "25-35"
-            elif isinstance(required_age_range, str):
-                if '-' in required_age_range:
-                    parts = required_age_range.split('-')
-                    min_age = int(parts[0].strip())
-                    max_age = int(parts[1].strip())
-                    return min_age <= age <= max_age
-            
-            return False
+            min_age, max_age = age_bounds
+            return min_age <= age <= max_age
         except:
             return False
     
-    def _check_experience(self, required_experience, profile):
+    def _check_experience(self, required_experience, profile, text):
         """Check if experience meets requirement"""
-        if not required_experience:
-            return True
-        
-        experiences = profile.get('experiences', [])
-        
         # If required_experience is a number (minimum years)
         if isinstance(required_experience, (int, float)):
             min_years = required_experience
-            total_months = 0
-            
-            for exp in experiences:
-                if isinstance(exp, dict):
-                    duration = exp.get('duration', '')
-                    years = 0
-                    months = 0
-                    year_match = re.search(r'(\d+)\s*yr', duration)
-                    if year_match:
-                        years = int(year_match.group(1))
-                    month_match = re.search(r'(\d+)\s*mo', duration)
-                    if month_match:
-                        months = int(month_match.group(1))
-                    total_months += (years * 12) + months
+            total_months = text.total_months
             
             total_years = total_months / 12
             return total_years >= min_years
         
         # If required_experience is a string (keyword to match)
         elif isinstance(required_experience, str):
-            keyword = required_experience.lower()
+            keyword = required_experience
             
-            for exp in experiences:
-                if isinstance(exp, dict):
-                    title = exp.get('title', '').lower()
-                    company = exp.get('company', '').lower()
-                    description = exp.get('description', '').lower()
-                    exp_text = f"{title} {company} {description}"
-                    
-                    # Check if keyword exists
-                    if keyword in exp_text:
-                        return True
-                    
-                    # Fuzzy match
-                    for word in exp_text.split():
-                        if fuzz.ratio(keyword, word) >= 80:
-                            return True
+            # Check if keyword exists
+            if any(keyword in exp_text for exp_text in text.exp_texts):
+                return True
             
-            return False
+            # Fuzzy match - one C-level pass over every experience word
+            exp_words = text.exp_words
+            return bool(exp_words) and process.extractOne(keyword, exp_words, scorer=fuzz.ratio, score_cutoff=80) is not None
         
         return False
     
-    def _check_skill(self, required_skill, profile):
+    def _check_skill(self, required_skill_lower, profile, text):
         """Check if skill exists in skills list OR in experience"""
-        if not required_skill:
+        # Exact skill name - a set lookup, no scan
+        if required_skill_lower in text.skill_name_set:
             return True
         
-        required_skill_lower = str(required_skill).lower()
-        
-        # Check in skills list first
-        skills = profile.get('skills', [])
-        for skill in skills:
-            skill_name = ''
-            if isinstance(skill, dict):
-                skill_name = skill.get('name', '').lower()
-            elif isinstance(skill, str):
-                skill_name = skill.lower()
-            
-            if not skill_name or skill_name == 'n/a':
-                continue
-            
-            # Exact or partial match
+        # Cheap substring checks on skills and experience (title, company, description)
+        # before any fuzzy matching - most skills that match at all match here
+        skill_names = text.skill_names
+        for skill_name in skill_names:
             if required_skill_lower in skill_name or skill_name in required_skill_lower:
                 return True
-            
-            # Fuzzy match (70% threshold)
-            if fuzz.ratio(required_skill_lower, skill_name) >= 70:
-                return True
         
-        # If not found in skills, check in experience (title, company, description)
-        experiences = profile.get('experiences', [])
-        for exp in experiences:
-            if isinstance(exp, dict):
-                title = exp.get('title', '').lower()
-                company = exp.get('company', '').lower()
-                description = exp.get('description', '').lower()
-                exp_text = f"{title} {company} {description}"
-                
-                # Check if skill keyword exists in experience
-                if required_skill_lower in exp_text:
-                    return True
-                
-                # Fuzzy match on individual words
-                for word in exp_text.split():
-                    if len(word) > 3 and fuzz.ratio(required_skill_lower, word) >= 75:
-                        return True
+        if any(required_skill_lower in exp_text for exp_text in text.exp_texts):
+            return True
+        
+        # Fuzzy match (70% threshold) - one C-level pass over every skill name
+        if skill_names and process.extractOne(required_skill_lower, text.skill_name_set, scorer=fuzz.ratio, score_cutoff=70):
+            return True
+        
+        # Fuzzy match on individual experience words
+        exp_words = text.long_exp_words
+        if exp_words and process.extractOne(required_skill_lower, exp_words, scorer=fuzz.ratio, score_cutoff=75):
+            return True
         
         return False
     
-    def _check_education(self, required_education, profile):
+    def _check_education(self, required_level, profile, text):
         """Check if education level meets requirement"""
-        if not required_education:
-            return True
-        
-        education = profile.get('education', [])
-        if not education:
+        if not profile.get('education', []):
             return False
         
-        levels = {
-            'high school': 1, 'sma': 1, 'smk': 1,
-            'diploma': 2, 'associate': 2, 'd3': 2,
-            'bachelor': 3, 's1': 3, 'sarjana': 3,
-            'master': 4, 's2': 4, 'mba': 4,
-            'doctoral': 5, 'phd': 5, 's3': 5
-        }
-        
-        # Get candidate's highest education level
-        highest = 0
-        for edu in education:
-            if isinstance(edu, dict):
-                degree = edu.get('degree', '').lower()
-                for level_name, level_val in levels.items():
-                    if level_name in degree and level_val > highest:
-                        highest = level_val
-        
-        # Get required education level
-        required_level = 0
-        required_education_lower = str(required_education).lower()
-        for level_name, level_val in levels.items():
-            if level_name in required_education_lower and level_val > required_level:
-                required_level = level_val
-        
-        return highest >= required_level
+        return text.education_level >= required_level
+
+
+_score_pool = None
+_score_pool_lock = threading.Lock()
+
+# template_id -> (requirements, ChecklistScorer); score() keeps no state, so one
+# scorer per template is shared by every worker (and kept per pool process)
+_scorers = {}
+
+
+def get_checklist_scorer(template_id, requirements):
+    """Scorer for a template, re-parsed only when its requirements change"""
+    cached = _scorers.get(template_id)
+    if cached and cached[0] == requirements:
+        return cached[1]
+    
+    scorer = ChecklistScorer(requirements)
+    _scorers[template_id] = (requirements, scorer)
+    return scorer
+
+
+def _score_profile_job(requirements, profile_data, template_id=None):
+    """Score one profile (module-level so the process pool can pickle it)"""
+    if template_id is None:
+        return ChecklistScorer(requirements).score(profile_data)
+    return get_checklist_scorer(template_id, requirements).score(profile_data)
+
+
+def score_profile(requirements, profile_data, template_id=None):
+    """Score a profile, fanning out to a process pool when SCORING_PROCESSES > 0
+    
+    Worker threads share the GIL, so fuzzy matching for several messages at
+    once only runs in parallel on separate processes. With a template_id the
+    parsed requirements are reused across profiles of that template.
+    """
+    global _score_pool
+    if SCORING_PROCESSES <= 0:
+        return _score_profile_job(requirements, profile_data, template_id)
+    
+    with _score_pool_lock:
+        if _score_pool is None:
+            # spawn, not fork - the parent already runs pika/supabase threads
+            _score_pool = ProcessPoolExecutor(
+                max_workers=SCORING_PROCESSES,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+    return _score_pool.submit(_score_profile_job, requirements, profile_data, template_id).result()
+
+
+def shutdown_score_pool():
+    """Stop the scoring process pool if it was started"""
+    global _score_pool
+    with _score_pool_lock:
+        pool, _score_pool = _score_pool, None
+    if pool:
+        pool.shutdown()
+
+
+# template_id -> (loaded_at, requirements); templates rarely change, so most
+# messages skip the search_templates round-trip
+REQUIREMENTS_CACHE_TTL = int(os.getenv('REQUIREMENTS_CACHE_TTL', '300'))  # seconds, 0 = no cache
+_requirements_cache = {}
+_requirements_cache_lock = threading.Lock()
 
 
 def load_requirements(template_id):
+    """Load requirements for a template, from cache when loaded within REQUIREMENTS_CACHE_TTL"""
+    with _requirements_cache_lock:
+        cached = _requirements_cache.get(template_id)
+    if cached and time.time() - cached[0] < REQUIREMENTS_CACHE_TTL:
+        return cached[1]
+    
+    requirements = fetch_requirements(template_id)
+    if requirements and REQUIREMENTS_CACHE_TTL > 0:
+        with _requirements_cache_lock:
+            _requirements_cache[template_id] = (time.time(), requirements)
+    return requirements
+
+
+def invalidate_requirements(template_id=None):
+    """Drop one template's cached requirements (or all of them)"""
+    with _requirements_cache_lock:
+        if template_id is None:
+            _requirements_cache.clear()
+        else:
+            _requirements_cache.pop(template_id, None)
+
+
+def fetch_requirements(template_id):
     """Load requirements from Supabase search_templates table"""
     if not supabase:
         print("⚠ Supabase not configured")
@@ -568,6 +799,35 @@ def load_requirements(template_id):
 
 
 
+# output_dir -> {(profile_url, requirements_id): filepath}, built by reading every
+# score file once and kept current by save_score_result, so a miss never re-reads
+# the whole directory
+scored_file_index = {}
+scored_file_index_lock = threading.Lock()
+
+
+def get_scored_file_index(output_dir):
+    """Get the {(profile_url, requirements_id): filepath} index for output_dir, building it on first use"""
+    with scored_file_index_lock:
+        index = scored_file_index.get(output_dir)
+        if index is None:
+            index = {}
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.name.endswith('_score.json'):
+                        continue
+                    try:
+                        with open(entry.path, 'rb') as f:
+                            data = json_loads(f.read())
+                        url = data.get('profile', {}).get('profile_url')
+                        if url:
+                            index.setdefault((url, data.get('requirements_id', '')), entry.path)
+                    except:
+                        continue
+            scored_file_index[output_dir] = index
+        return index
+
+
 def check_if_already_scored(profile_url, requirements_id, output_dir=OUTPUT_DIR):
     """Check if profile has already been scored for this requirement"""
     if not os.path.exists(output_dir):
@@ -575,25 +835,20 @@ def check_if_already_scored(profile_url, requirements_id, output_dir=OUTPUT_DIR)
     
     url_hash = get_profile_hash(profile_url)
     
-    # Search for existing files with this URL hash and requirements_id
-    pattern = os.path.join(output_dir, f"*_{requirements_id}_*_{url_hash}_score.json")
-    existing_files = glob.glob(pattern)
-    
-    if existing_files:
-        return True, existing_files[0]
+    # Look for a file named *_{requirements_id}_*_{url_hash}_score.json with plain
+    # string checks (also catches files written by other scoring processes)
+    needle = f"_{requirements_id}_"
+    suffix = f"_{url_hash}_score.json"
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith(suffix) and not name.startswith('.') and needle in name[:-len(suffix)]:
+                return True, entry.path
     
-    # Fallback: check by reading all score JSON files
-    all_files = glob.glob(os.path.join(output_dir, "*_score.json"))
-    for filepath in all_files:
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                profile = data.get('profile', {})
-                req_id = data.get('requirements_id', '')
-                if profile.get('profile_url') == profile_url and req_id == requirements_id:
-                    return True, filepath
-        except:
-            continue
+    # Not in the index = not saved under another name (no per-file reads on a miss)
+    filepath = get_scored_file_index(output_dir).get((profile_url, requirements_id))
+    if filepath:
+        return True, filepath
     
     return False, None
 
@@ -637,110 +892,144 @@ def save_score_result(profile_data, score_result, requirements_id):
     }
     
     # Save to file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    with open(filepath, 'wb') as f:
+        f.write(json_dumps_bytes(output))
+    
+    if profile_url:
+        get_scored_file_index(OUTPUT_DIR)[(profile_url, requirements_id)] = filepath
     
     print(f"💾 Score saved to: {filepath}")
     return filepath
 
 
-def update_supabase_score(profile_url, percentage, profile_data=None, score_result=None):
-    """Update score and profile data in Supabase leads_list table
+def update_supabase_score(profile_url, percentage, profile_data=None, score_result=None, template_id=None):
+    """Upsert score and profile data for one lead in Supabase leads_list
+    
+    ALWAYS overwrites the existing score and processed_at; the write is an
+    upsert on profile_url, so two workers can't both insert the same lead
+    """
+    return upsert_score_rows([(build_score_row(profile_url, percentage, profile_data, score_result), template_id)])
+
+
+def build_score_row(profile_url, percentage, profile_data=None, score_result=None):
+    """leads_list upsert row for a scored profile
     
-    ALWAYS overwrites existing score with new score and updates scored_at to current date
+    profile_data is included whenever given; upsert_score_rows drops it for
+    leads that already have it and adds the insert-only columns for new leads.
     """
+    row = {
+        'profile_url': profile_url,
+        'score': percentage,
+        'processed_at': datetime.now().isoformat()
+    }
+    if score_result:
+        row['scoring_data'] = score_result
+    if profile_data:
+        if profile_data.get('name'):
+            row['name'] = profile_data['name']
+        row['profile_data'] = profile_data
+    return row
+
+
+def _prepare_score_rows(rows):
+    """Apply the old update-vs-insert rules to a batch of score rows
+    
+    Existing leads keep their profile_data unless it is empty; brand-new leads
+    (shouldn't happen if the crawler ran first) are created as 'scored'.
+    One light select per batch tells the cases apart: a row per existing lead,
+    with has_profile null when its profile_data is null or {}.
+    """
+    urls = [row['profile_url'] for row in rows]
+    result = supabase.table('leads_list')\
+        .select('profile_url, has_profile:profile_data->profile_url')\
+        .in_('profile_url', urls)\
+        .execute()
+    existing = {r['profile_url']: r.get('has_profile') is not None for r in result.data or []}
+    
+    prepared = []
+    for row in rows:
+        url = row['profile_url']
+        if url not in existing:
+            row = {**row, 'connection_status': 'scored'}
+            if 'profile_data' in row:
+                row.setdefault('name', 'Unknown')
+        elif existing[url] and 'profile_data' in row:
+            row = {key: value for key, value in row.items() if key != 'profile_data'}
+        prepared.append(row)
+    return prepared
+
+
+def upsert_score_rows(score_rows):
+    """Write (row, template_id) pairs to leads_list with one upsert per column set
+    
+    Existing leads are overwritten on profile_url (score, scoring_data, name;
+    profile_data only if missing); then each template's schedule is checked
+    once for completion. Only the last row per profile_url is sent - Postgres
+    rejects an upsert that touches the same row twice.
+    """
+    if not score_rows:
+        return True
+    
     try:
-        print(f"📤 Updating Supabase...")
-        
-        # Check if lead exists first
-        existing = supabase.table('leads_list').select('id, profile_data, score').eq('profile_url', profile_url).execute()
+        rows = list({row['profile_url']: row for row, _ in score_rows}.values())
         
-        # Prepare update data - ALWAYS update score and processed_at
-        update_data = {
-            'score': percentage,
-            'processed_at': datetime.now().isoformat()
-        }
+        # PostgREST bulk upsert needs identical keys in every row
+        groups = {}
+        for row in _prepare_score_rows(rows):
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        for rows in groups.values():
+            supabase.table('leads_list').upsert(rows, on_conflict='profile_url', returning='minimal').execute()
         
-        # Add scoring_data (checklist results) if provided
-        if score_result:
-            update_data['scoring_data'] = score_result
-        
-        # Add profile data if provided and not already in database
-        if profile_data:
-            # Update name if available
-            if profile_data.get('name'):
-                update_data['name'] = profile_data.get('name')
-            
-            # If profile_data doesn't exist in DB yet, save it
-            if existing.data and len(existing.data) > 0:
-                existing_profile_data = existing.data[0].get('profile_data')
-                if not existing_profile_data or existing_profile_data == {}:
-                    # No profile data yet, save it
-                    update_data['profile_data'] = profile_data
-                    print(f"  → Adding profile_data to existing lead")
-            else:
-                # Lead doesn't exist, will be created with profile data
-                update_data['profile_data'] = profile_data
-                update_data['date'] = datetime.now().date().isoformat()
-                update_data['connection_status'] = 'scored'
-        
-        # Update or insert
-        if existing.data and len(existing.data) > 0:
-            # Update existing lead - OVERWRITE score
-            old_score = existing.data[0].get('score')
-            response = supabase.table('leads_list').update(update_data).eq('profile_url', profile_url).execute()
-            
-            if response.data:
-                if old_score is not None:
-                    print(f"✓ Supabase updated: {profile_url} → score: {old_score}% → {percentage}% (overwritten)")
-                else:
-                    print(f"✓ Supabase updated: {profile_url} → score: {percentage}% (new)")
-                
-                # Check if schedule is completed and send webhook if needed
-                WebhookChecker.check_and_send_webhook(supabase, template_id)
-                
-                return True
-            else:
-                print(f"⚠ Failed to update Supabase")
-                return False
-        else:
-            # Insert new lead (shouldn't happen if crawler ran first, but handle it)
-            insert_data = {
-                'profile_url': profile_url,
-                'score': percentage,
-                'processed_at': datetime.now().isoformat(),
-                'date': datetime.now().date().isoformat(),
-                'connection_status': 'scored'
-            }
-            
-            if score_result:
-                insert_data['scoring_data'] = score_result
-            
-            if profile_data:
-                insert_data['name'] = profile_data.get('name', 'Unknown')
-                insert_data['profile_data'] = profile_data
-            
-            response = supabase.table('leads_list').insert(insert_data).execute()
-            
-            if response.data:
-                print(f"✓ Supabase inserted: {profile_url} → score: {percentage}%")
-                return True
-            else:
-                print(f"⚠ Failed to insert to Supabase")
-                return False
-    
+        print(f"✓ Supabase upserted {len(score_rows)} score(s)")
     except Exception as e:
-        print(f"✗ Failed to update Supabase: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"✗ Failed to upsert {len(score_rows)} score(s) to Supabase: {e}")
         return False
+    
+    for template_id in {template_id for _, template_id in score_rows if template_id}:
+        WebhookChecker.check_and_send_webhook(supabase, template_id)
+    return True
 
 
+def write_score_entries(entries):
+    """Upsert (row, template_id, profile_data, score_result) entries, then save their score files
+    
+    Files are only written once the rows are in Supabase, so a message whose row
+    never made it isn't skipped as already scored when it is redelivered.
+    """
+    if not upsert_score_rows([(row, template_id) for row, template_id, _, _ in entries]):
+        return False
+    for _, template_id, profile_data, score_result in entries:
+        save_score_result(profile_data, score_result, template_id)
+    return True
 
 
+def print_checklist(name, score_result):
+    """Print the requirement checklist of a score result as one write"""
+    lines = [
+        f"\n{'='*60}",
+        f"SCORE RESULT: {name}",
+        f"{'='*60}",
+        f"Matched: {score_result['matched']}/{score_result['total_requirements']}",
+        f"Percentage: {score_result['percentage']}%",
+        f"\nRequirements Checklist:"
+    ]
+    for result in score_result['results']:
+        status = "✓" if result['matched'] else "✗"
+        candidate_val = result['candidate_value']
+        lines.append(f"  {status} {result['label']}")
+        if not result['matched'] and candidate_val != 'N/A':
+            lines.append(f"    → Candidate: {candidate_val}")
+    lines.append(f"{'='*60}")
+    print('\n'.join(lines))
 
-def process_message(message_data):
-    """Process a single scoring message"""
+
+def process_message(message_data, score_rows=None):
+    """Process a single scoring message
+    
+    With a score_rows list, the Supabase row is appended as
+    (row, template_id, profile_data, score_result) for write_score_entries
+    instead of being written right away.
+    """
     try:
         profile_data = message_data.get('profile_data')
         template_id = message_data.get('template_id')
@@ -759,8 +1048,9 @@ def process_message(message_data):
             return False
         
         name = profile_data.get('name', 'Unknown')
-        print(f"\n📥 Processing: {name}")
-        print(f"   Template ID: {req_id}")
+        if SCORING_VERBOSE:
+            print(f"\n📥 Processing: {name}")
+            print(f"   Template ID: {req_id}")
         
         # Check if already scored
         if profile_url:
@@ -778,43 +1068,29 @@ def process_message(message_data):
             return False
         
         # Calculate score
-        print(f"🔢 Calculating score...")
-        scorer = ChecklistScorer(requirements)
-        score_result = scorer.score(profile_data)
+        score_result = score_profile(requirements, profile_data, req_id)
         
         # Print result
-        print(f"\n{'='*60}")
-        print(f"SCORE RESULT: {name}")
-        print(f"{'='*60}")
-        print(f"Matched: {score_result['matched']}/{score_result['total_requirements']}")
-        print(f"Percentage: {score_result['percentage']}%")
-        
-        print(f"\nRequirements Checklist:")
-        for result in score_result['results']:
-            status = "✓" if result['matched'] else "✗"
-            label = result['label']
-            candidate_val = result['candidate_value']
-            print(f"  {status} {label}")
-            if not result['matched'] and candidate_val != 'N/A':
-                print(f"    → Candidate: {candidate_val}")
-        print(f"{'='*60}")
-        
-        # Save result
-        save_score_result(profile_data, score_result, req_id)
-        
-        # Update Supabase
-        if supabase:
-            profile_url = profile_data.get('profile_url', '')
+        if SCORING_VERBOSE:
+            print_checklist(name, score_result)
+        
+        # Update Supabase (or leave the row for the caller's next batched upsert);
+        # the score file is saved only after the row is written
+        if supabase and profile_url:
             percentage = score_result.get('percentage', 0)
-            if profile_url:
-                if update_supabase_score(profile_url, percentage, profile_data, score_result):
-                    stats_manager.increment('supabase_updated')
-                else:
-                    stats_manager.increment('supabase_failed')
-                    with stats['lock']:
-                        stats['supabase_failed'] += 1
+            if score_rows is not None:
+                row = build_score_row(profile_url, percentage, profile_data, score_result)
+                score_rows.append((row, req_id, profile_data, score_result))
+            elif update_supabase_score(profile_url, percentage, profile_data, score_result, req_id):
+                stats_manager.increment('supabase_updated')
+                save_score_result(profile_data, score_result, req_id)
+            else:
+                stats_manager.increment('supabase_failed')
+                return False
         else:
-            print("⚠ Supabase not configured, skipping database update")
+            if not supabase:
+                print("⚠ Supabase not configured, skipping database update")
+            save_score_result(profile_data, score_result, req_id)
         
         print(f"✓ Completed: {name} - Score: {score_result['percentage']}%")
         
@@ -839,8 +1115,8 @@ def worker_thread(worker_id):
         # Declare queue
         channel.queue_declare(queue=SCORING_QUEUE, durable=True)
         
-        # Set QoS - only process 1 message at a time
-        channel.basic_qos(prefetch_count=1)
+        # Set QoS - keep a window of messages in flight, acked in batches
+        channel.basic_qos(prefetch_count=RABBITMQ_PREFETCH)
         
         print(f"[Worker {worker_id}] Connected to RabbitMQ")
         print(f"[Worker {worker_id}] Listening to queue: {SCORING_QUEUE}")
@@ -849,32 +1125,104 @@ def worker_thread(worker_id):
         print(f"[Worker {worker_id}] Failed to connect to RabbitMQ: {e}")
         return
     
+    # Processed messages not yet acked, in delivery order (tags only increase per
+    # channel): (delivery_tag, redelivered, score entries). Their rows are written
+    # in one upsert just before the multi-ack.
+    pending = []
+    failed_flushes = 0
+    retry_scheduled = False
+    
+    def flush_acks():
+        """Write pending scores, then ack every pending message with one multi-ack
+        
+        If the upsert fails nothing is acked and the flush is retried; after
+        MAX_FLUSH_RETRIES failures each message is written on its own instead.
+        """
+        nonlocal failed_flushes, retry_scheduled
+        if not pending or retry_scheduled:
+            return
+        entries = [entry for _, _, message_entries in pending for entry in message_entries]
+        if entries and not write_score_entries(entries):
+            stats_manager.increment('supabase_failed')
+            failed_flushes += 1
+            if failed_flushes < MAX_FLUSH_RETRIES:
+                retry_scheduled = True
+                print(f"[Worker {worker_id}] ⚠ Score upsert failed, holding {len(pending)} acks (retry in {ACK_FLUSH_SECONDS}s)")
+                connection.call_later(ACK_FLUSH_SECONDS, retry_flush)
+            else:
+                print(f"[Worker {worker_id}] ⚠ Score upsert failed {failed_flushes}x, writing {len(pending)} message(s) one by one")
+                flush_one_by_one()
+            return
+        for _ in entries:
+            stats_manager.increment('supabase_updated')
+        failed_flushes = 0
+        channel.basic_ack(delivery_tag=pending[-1][0], multiple=True)
+        pending.clear()
+    
+    def flush_one_by_one():
+        """Write and ack each pending message separately, nacking only those that fail
+        
+        A failed message has no score file yet, so it is requeued once to be scored
+        again; on its redelivery it is dropped instead of looping.
+        """
+        nonlocal failed_flushes
+        for delivery_tag, redelivered, message_entries in pending:
+            if not message_entries or write_score_entries(message_entries):
+                for _ in message_entries:
+                    stats_manager.increment('supabase_updated')
+                channel.basic_ack(delivery_tag=delivery_tag)
+            else:
+                stats_manager.increment('failed')
+                channel.basic_nack(delivery_tag=delivery_tag, requeue=not redelivered)
+        pending.clear()
+        failed_flushes = 0
+    
+    def retry_flush():
+        """Timer callback for a flush that failed to write its scores"""
+        nonlocal retry_scheduled
+        retry_scheduled = False
+        flush_acks()
+    
+    def ack(method, score_entries):
+        """Queue an ack, flushing when the batch is full or the timer fires"""
+        if not pending:
+            connection.call_later(ACK_FLUSH_SECONDS, flush_acks)
+        pending.append((method.delivery_tag, method.redelivered, score_entries))
+        if len(pending) >= ACK_BATCH_SIZE:
+            flush_acks()
+    
+    def nack(delivery_tag):
+        """Reject one message (after flushing earlier acks); don't requeue to avoid infinite loop"""
+        flush_acks()
+        channel.basic_nack(delivery_tag=delivery_tag, requeue=False)
+    
     def callback(ch, method, properties, body):
         """Process each message"""
         try:
             stats_manager.increment('processing')
             
             # Parse message
-            message_data = json.loads(body)
+            message_data = decode_message(body, properties)
             
             # Process
-            success = process_message(message_data)
+            score_entries = []
+            success = process_message(message_data, score_entries)
             
             if success:
                 stats_manager.increment('completed')
-                ch.basic_ack(delivery_tag=method.delivery_tag)
+                ack(method, score_entries)
             else:
                 stats_manager.increment('failed')
-                # Don't requeue to avoid infinite loop
-                ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+                nack(method.delivery_tag)
             
             # Print stats
-            stats_manager.print_stats("SCORING STATISTICS")
+            if next(_messages_handled) % STATS_PRINT_EVERY == 0:
+                stats_manager.print_stats("SCORING STATISTICS")
         
         except Exception as e:
             print(f"[Worker {worker_id}] Fatal error: {e}")
             stats_manager.increment('failed')
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            nack(method.delivery_tag)
         
         finally:
             stats_manager.decrement('processing')
@@ -896,6 +1244,7 @@ def worker_thread(worker_id):
         print(f"[Worker {worker_id}] Error: {e}")
     finally:
         try:
+            flush_acks()
             connection.close()
         except:
             pass
@@ -925,6 +1274,8 @@ def main():
     print(f"  - RabbitMQ: {RABBITMQ_HOST}:{RABBITMQ_PORT}")
     print(f"  - Queue: {SCORING_QUEUE}")
     print(f"  - Workers: {num_workers}")
+    if SCORING_PROCESSES > 0:
+        print(f"  - Scoring processes: {SCORING_PROCESSES}")
     print(f"  - Output: {OUTPUT_DIR}/")
     
     # Test RabbitMQ connection
@@ -973,6 +1324,7 @@ def main():
     finally:
         # Wait for workers to finish
         time.sleep(2)
+        shutdown_score_pool()
         
         # Final stats
         print("\n" + "="*60)
@@ -6,10 +6,54 @@ import sys
 import json
 import re
 from pathlib import Path
+from textwrap import shorten
 import requests
 from bs4 import BeautifulSoup
 
 
+# Required skill weights (skills not listed get DEFAULT_SKILL_WEIGHT)
+SKILL_WEIGHTS = {
+    'Communication': 10,
+    'Negotiation': 10,
+    'Computer Skills': 5,
+    'Microsoft Office': 5
+}
+DEFAULT_SKILL_WEIGHT = 5
+
+# parsed_data key -> requirements key, copied only when a value was parsed
+DEMOGRAPHIC_FIELDS = (
+    ('gender', 'required_gender'),
+    ('location', 'required_location'),
+    ('age_range', 'required_age_range')
+)
+
+_SLUG_RE = re.compile(r'[^a-z0-9_]')
+
+# Capture is bounded so long letter runs can't be re-scanned endlessly
+_LOCATION_RE = re.compile(r'\bpenempatan\s*:?\s*([A-Za-z\s]{1,60})', re.IGNORECASE)
+
+# Experience phrase -> keyword; debt collection only counts alongside one of the others
+EXPERIENCE_PHRASES = (
+    ('desk collection', 'Desk Collection'),
+    ('call collection', 'Call Collection'),
+    ('telecollection', 'Telecollection'),
+    ('debt collection', 'Debt Collection')
+)
+_EXPERIENCE_PHRASE_RE = re.compile('|'.join(re.escape(phrase) for phrase, _ in EXPERIENCE_PHRASES))
+
+# Skill label -> phrases that signal it; matched in one pass per line
+SKILL_PHRASES = (
+    ('Communication', ('komunikasi', 'communication')),
+    ('Negotiation', ('negosiasi', 'negotiation')),
+    ('Computer Skills', ('komputer', 'computer')),
+    ('Microsoft Office', ('microsoft office', 'ms office'))
+)
+_SKILL_LABELS = {phrase: label for label, phrases in SKILL_PHRASES for phrase in phrases}
+_SKILL_PHRASE_RE = re.compile('|'.join(
+    re.escape(phrase) for phrase in sorted(_SKILL_LABELS, key=len, reverse=True)
+))
+
+
 def fetch_page(url):
     """Fetch HTML content from URL"""
     try:
@@ -121,7 +165,7 @@ def parse_kualifikasi(text):
         # Location
         if 'penempatan' in line_lower:
             # Extract city name after "penempatan:"
-            location_match = re.search(r'penempatan\s*:?\s*([A-Za-z\s]+)', line, re.IGNORECASE)
+            location_match = _LOCATION_RE.search(line)
             if location_match:
                 data['location'] = location_match.group(1).strip()
         
@@ -131,35 +175,17 @@ def parse_kualifikasi(text):
             data['min_experience_years'] = int(exp_match.group(1))
         
         # Experience keywords
-        if 'desk collection' in line_lower or 'call collection' in line_lower or 'telecollection' in line_lower:
-            if 'desk collection' in line_lower:
-                data['experience_keywords'].append('Desk Collection')
-            if 'call collection' in line_lower:
-                data['experience_keywords'].append('Call Collection')
-            if 'telecollection' in line_lower:
-                data['experience_keywords'].append('Telecollection')
-            if 'debt collection' in line_lower:
-                data['experience_keywords'].append('Debt Collection')
+        found_phrases = {m.group() for m in _EXPERIENCE_PHRASE_RE.finditer(line_lower)}
+        if found_phrases - {'debt collection'}:
+            for phrase, keyword in EXPERIENCE_PHRASES:
+                if phrase in found_phrases:
+                    data['experience_keywords'].append(keyword)
         
-        # Skills - Communication
-        if 'komunikasi' in line_lower or 'communication' in line_lower:
-            if 'komunikasi' not in [s.lower() for s in data['skills']]:
-                data['skills'].append('Communication')
-        
-        # Skills - Negotiation
-        if 'negosiasi' in line_lower or 'negotiation' in line_lower:
-            if 'negotiation' not in [s.lower() for s in data['skills']]:
-                data['skills'].append('Negotiation')
-        
-        # Skills - Computer
-        if 'komputer' in line_lower or 'computer' in line_lower:
-            if 'computer skills' not in [s.lower() for s in data['skills']]:
-                data['skills'].append('Computer Skills')
-        
-        # Skills - Microsoft Office
-        if 'microsoft office' in line_lower or 'ms office' in line_lower:
-            if 'microsoft office' not in [s.lower() for s in data['skills']]:
-                data['skills'].append('Microsoft Office')
+        # Skills
+        found_skills = {_SKILL_LABELS[m.group()] for m in _SKILL_PHRASE_RE.finditer(line_lower)}
+        for label, _ in SKILL_PHRASES:
+            if label in found_skills and label not in data['skills']:
+                data['skills'].append(label)
     
     return data
 
@@ -173,7 +199,7 @@ def build_requirements_json(parsed_data, position_title, job_description):
     
     requirements = {
         'position': position_title,
-        'job_description': job_description[:500] + '...' if len(job_description) > 500 else job_description,
+        'job_description': job_description if len(job_description) <= 500 else shorten(job_description, width=500, placeholder='...'),
         'min_experience_years': parsed_data['min_experience_years'] or 1
     }
     
@@ -188,18 +214,10 @@ def build_requirements_json(parsed_data, position_title, job_description):
         ]
     
     # Skills
-    required_skills = {}
-    for skill in parsed_data['skills']:
-        if skill == 'Communication':
-            required_skills[skill] = 10
-        elif skill == 'Negotiation':
-            required_skills[skill] = 10
-        elif skill == 'Computer Skills':
-            required_skills[skill] = 5
-        elif skill == 'Microsoft Office':
-            required_skills[skill] = 5
-        else:
-            required_skills[skill] = 5
+    required_skills = {
+        skill: SKILL_WEIGHTS.get(skill, DEFAULT_SKILL_WEIGHT)
+        for skill in parsed_data['skills']
+    }
     
     if required_skills:
         requirements['required_skills'] = required_skills
@@ -219,14 +237,9 @@ def build_requirements_json(parsed_data, position_title, job_description):
         requirements['education_level'] = ['High School', 'Diploma', 'Bachelor']
     
     # Demographics
-    if parsed_data['gender']:
-        requirements['required_gender'] = parsed_data['gender']
-    
-    if parsed_data['location']:
-        requirements['required_location'] = parsed_data['location']
-    
-    if parsed_data['age_range']:
-        requirements['required_age_range'] = parsed_data['age_range']
+    for source_key, requirement_key in DEMOGRAPHIC_FIELDS:
+        if parsed_data[source_key]:
+            requirements[requirement_key] = parsed_data[source_key]
     
     return requirements
 
@@ -306,8 +319,7 @@ def main():
     requirements = build_requirements_json(parsed_data, position, kualifikasi_text)
     
     # Save
-    filename_slug = position.lower().replace(' ', '_').replace('/', '_')
-    filename_slug = re.sub(r'[^a-z0-9_]', '', filename_slug)
+    filename_slug = _SLUG_RE.sub('', position.lower().replace(' ', '_').replace('/', '_'))
     default_filename = f"{filename_slug}.json"
     
     filename = input(f"\nSave as (default: {default_filename}): ").strip()
@@ -320,12 +332,13 @@ def main():
     filepath = Path('requirements') / filename
     filepath.parent.mkdir(exist_ok=True)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(requirements, f, indent=2, ensure_ascii=False)
+    # Serialize once - the same text is saved and previewed
+    requirements_json = json.dumps(requirements, indent=2, ensure_ascii=False)
+    filepath.write_text(requirements_json, encoding='utf-8')
     
     print(f"\n✓ Requirements saved to: {filepath}")
     print("\nPreview:")
-    print(json.dumps(requirements, indent=2, ensure_ascii=False))
+    print(requirements_json)
 
 
 if __name__ == "__main__":